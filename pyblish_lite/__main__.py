@@ -1,19 +1,75 @@
-from .app import show
-
-
 if __name__ == '__main__':
     import argparse
+    import sys
 
     parser = argparse.ArgumentParser()
     parser.add_argument("--debug", action="store_true")
+    parser.add_argument("--headless", action="store_true",
+                        help="Publish without a window, writing each "
+                             "result as a line of JSON")
+    parser.add_argument("--batch",
+                        help="Publish each work item in this JSON file "
+                             "in a pool of processes")
+    parser.add_argument("--processes", type=int,
+                        help="Size of the batch pool, defaults to "
+                             "the number of cores")
+    parser.add_argument("--output",
+                        help="Write headless or batch results to this "
+                             "file, rather than stdout")
+    parser.add_argument("--path", action="append", default=[],
+                        help="Register an additional plug-in path")
 
     args = parser.parse_args()
 
+    import pyblish.api
+
+    plugins = list()
+
     if args.debug:
         from . import mock
-        import pyblish.api
 
-        for Plugin in mock.plugins:
-            pyblish.api.register_plugin(Plugin)
+        plugins = mock.plugins
+
+    if args.batch:
+        import json
+        from . import batch
+
+        with open(args.batch) as f:
+            items = json.load(f)
+
+        # Registered in each process of the pool, as processes
+        # started afresh do not inherit those of this process.
+        summary = batch.publish(items, args.processes,
+                                paths=args.path,
+                                plugins=plugins)
+
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(summary, f, indent=4)
+        else:
+            print(json.dumps(summary, indent=4))
+
+        sys.exit(0 if summary["success"] else 1)
+
+    for Plugin in plugins:
+        pyblish.api.register_plugin(Plugin)
+
+    for path in args.path:
+        pyblish.api.register_plugin_path(path)
+
+    if args.headless:
+        from . import headless
+
+        if args.output:
+            with open(args.output, "w") as f:
+                summary = headless.publish(f)
+        else:
+            summary = headless.publish()
+
+        sys.exit(0 if summary["success"] else 1)
+
+    # Imported here, as the graphical user interface
+    # is not available without a window manager.
+    from .app import show
 
     show()
@@ -0,0 +1,139 @@
+"""Publish many scenes in parallel
+
+Each work item is published in a session of its own, via
+:func:`headless.publish`, in a bounded pool of processes. This avoids
+paying for the startup of an interpreter and window per item, which
+dominates when re-publishing thousands of assets.
+
+A work item is a dictionary.
+
+    {
+        "scene": "/path/to/scene.ma",
+        "paths": ["/path/to/plugins"],
+        "data": {"assetName": "hero"},
+        "output": "/path/to/results.jsonl"
+    }
+
+Only "scene" is required. "paths" are registered as plug-in paths for
+the duration of the item, "data" is added to the Context alongside the
+scene, available as context.data["currentFile"], and "output" is where
+the results of each pair are written as JSON lines.
+
+Plug-ins and paths registered in the calling process are not available
+to processes of the pool started afresh, as on Windows and macOS. Pass
+those common to every item to :func:`publish` instead.
+
+Usage:
+    $ python -m pyblish_lite --batch items.json --processes 4
+
+"""
+
+import multiprocessing
+import os
+import time
+import traceback
+
+import pyblish.api
+
+from . import headless
+
+
+class CollectWorkItem(pyblish.api.ContextPlugin):
+    """Add the current work item to the Context"""
+
+    order = pyblish.api.CollectorOrder - 0.49
+    label = "Work Item"
+
+    # Assigned prior to each session
+    item = {}
+
+    def process(self, context):
+        context.data.update(self.item.get("data", {}))
+        context.data["currentFile"] = self.item["scene"]
+
+
+def publish(items, processes=None, paths=None, plugins=None):
+    """Publish each of `items` in a pool of processes
+
+    Arguments:
+        items (list): Work items, see above
+        processes (int, optional): Size of pool, defaults
+            to the number of cores
+        paths (list, optional): Plug-in paths to register
+            for every item
+        plugins (list, optional): Plug-ins to register for every
+            item, importable by the processes of the pool
+
+    Returns:
+        summary (dict): Overall success, along with the
+            summary of each item in the order of `items`
+
+    """
+
+    before = time.time()
+
+    pool = multiprocessing.Pool(processes,
+                                initializer=_initialize,
+                                initargs=(paths or [], plugins or []))
+
+    try:
+        results = pool.map(_publish_item, items, chunksize=1)
+
+    finally:
+        pool.close()
+        pool.join()
+
+    return {
+        "type": "summary",
+        "success": all(result["success"] for result in results),
+        "items": len(results),
+        "failed": sum(1 for result in results if not result["success"]),
+        "duration": (time.time() - before) * 1000,  # ms
+        "results": results,
+    }
+
+
+def _initialize(paths, plugins):
+    """Register `paths` and `plugins` in a process of the pool"""
+    for path in paths:
+        pyblish.api.register_plugin_path(path)
+
+    for plugin in plugins:
+        pyblish.api.register_plugin(plugin)
+
+
+def _publish_item(item):
+    """Publish a single work `item`, in a process of the pool"""
+    paths = item.get("paths", [])
+
+    for path in paths:
+        pyblish.api.register_plugin_path(path)
+
+    CollectWorkItem.item = item
+    pyblish.api.register_plugin(CollectWorkItem)
+
+    output = item.get("output") or os.devnull
+
+    try:
+        with open(output, "w") as f:
+            summary = headless.publish(f)
+
+    except Exception:
+        summary = {
+            "type": "summary",
+            "success": False,
+            "processed": 0,
+            "failed": 0,
+            "duration": 0.0,
+            "error": traceback.format_exc(),
+        }
+
+    finally:
+        pyblish.api.deregister_plugin(CollectWorkItem)
+
+        for path in paths:
+            pyblish.api.deregister_plugin_path(path)
+
+    summary["scene"] = item["scene"]
+
+    return summary
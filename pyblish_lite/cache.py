@@ -0,0 +1,259 @@
+"""Results of validation and check states, persisted on disk
+
+Validators are typically re-run on data identical to what they last
+validated, such as after re-opening a scene. Results are stored in an
+sqlite database keyed on the hash of a plug-in's source code along
+with the hash of an instance's data and members, such that a change
+to either misses the cache.
+
+Only passing results are stored, and only as many as `size`, the least
+recently used results being discarded first.
+
+Likewise, artists publishing the same scene repeatedly toggle the same
+instances and plug-ins each time. Their check states are stored per
+project, see :class:`CheckStateCache`.
+
+"""
+
+import hashlib
+import os
+import pickle
+import struct
+import threading
+import time
+
+try:
+    import sqlite3
+except ImportError:
+    # Not every host ships with sqlite
+    sqlite3 = None
+
+from . import util
+
+
+class ValidationCache(object):
+    """Size-bounded store of passing results
+
+    Arguments:
+        path (str, optional): Database file, defaults to
+            validation.db in the cache directory of the user
+        size (int, optional): Maximum number of results
+
+    """
+
+    def __init__(self, path=None, size=100000):
+        if sqlite3 is None:
+            raise RuntimeError("Validation cache requires sqlite3")
+
+        path = path or os.path.join(util.cache_dir(), "validation.db")
+
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+
+        self.path = path
+        self.size = size
+
+        # Validators may run in multiple threads, see `threadsafe`
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "plugin TEXT, "
+            "plugin_hash TEXT, "
+            "instance_hash TEXT, "
+            "value BLOB, "
+            "used REAL, "
+            "PRIMARY KEY (plugin_hash, instance_hash))"
+        )
+        self._db.commit()
+
+    def get(self, key):
+        """Return result stored under `key`, or None
+
+        Arguments:
+            key (tuple): Hash of plug-in and of instance
+
+        """
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM results "
+                "WHERE plugin_hash = ? AND instance_hash = ?", key
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self._db.execute(
+                "UPDATE results SET used = ? "
+                "WHERE plugin_hash = ? AND instance_hash = ?",
+                (time.time(),) + tuple(key)
+            )
+
+        return pickle.loads(bytes(row[0]))
+
+    def set(self, key, plugin, value):
+        """Store `value` under `key`
+
+        Arguments:
+            key (tuple): Hash of plug-in and of instance
+            plugin (str): Name of plug-in, for invalidation
+            value (dict): Picklable data of result
+
+        """
+
+        value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (plugin,) + tuple(key) + (sqlite3.Binary(value), time.time())
+            )
+
+    def invalidate(self, plugin=None):
+        """Forget stored results
+
+        Arguments:
+            plugin (str, optional): Only forget results of plug-ins
+                of this name, defaults to forgetting all results
+
+        """
+
+        with self._lock:
+            if plugin is None:
+                self._db.execute("DELETE FROM results")
+            else:
+                self._db.execute(
+                    "DELETE FROM results WHERE plugin = ?", (plugin,))
+
+            self._db.commit()
+
+    def flush(self):
+        """Write pending results and discard those beyond `size`"""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM results WHERE rowid IN ("
+                "SELECT rowid FROM results "
+                "ORDER BY used DESC LIMIT -1 OFFSET ?)", (self.size,)
+            )
+            self._db.commit()
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+class CheckStateCache(object):
+    """Size-bounded store of check states, per project
+
+    Keys and projects are stored as 64-bit hashes. States are written
+    once flushed, such that toggling many items writes once.
+
+    Arguments:
+        path (str, optional): Database file, defaults to
+            checkstate.db in the cache directory of the user
+        size (int, optional): Maximum number of states
+
+    """
+
+    def __init__(self, path=None, size=10000):
+        if sqlite3 is None:
+            raise RuntimeError("Check state cache requires sqlite3")
+
+        path = path or os.path.join(util.cache_dir(), "checkstate.db")
+
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+
+        self.path = path
+        self.size = size
+
+        # States are loaded in a thread of their own
+        self._lock = threading.Lock()
+        self._pending = dict()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS states ("
+            "project INTEGER, "
+            "key INTEGER, "
+            "state INTEGER, "
+            "used REAL, "
+            "PRIMARY KEY (project, key))"
+        )
+        self._db.commit()
+
+    def load(self, project):
+        """Return states of `project`, by hash of key
+
+        Arguments:
+            project (str): Name of project
+
+        """
+
+        project = hash_key(project)
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, state FROM states WHERE project = ?",
+                (project,)
+            ).fetchall()
+
+            self._db.execute(
+                "UPDATE states SET used = ? WHERE project = ?",
+                (time.time(), project)
+            )
+            self._db.commit()
+
+        return dict((key, bool(state)) for key, state in rows)
+
+    def set(self, project, key, state):
+        """Store `state` of `key` once flushed
+
+        Arguments:
+            project (str): Name of project
+            key (str): Key of item, see Item.checkstate_key
+            state (bool): Whether item is checked
+
+        """
+
+        with self._lock:
+            self._pending[(hash_key(project), hash_key(key))] = state
+
+    def flush(self):
+        """Write pending states and discard those beyond `size`"""
+        with self._lock:
+            used = time.time()
+
+            self._db.executemany(
+                "INSERT OR REPLACE INTO states VALUES (?, ?, ?, ?)",
+                [(project, key, int(state), used)
+                 for (project, key), state in self._pending.items()]
+            )
+            self._pending.clear()
+
+            self._db.execute(
+                "DELETE FROM states WHERE rowid IN ("
+                "SELECT rowid FROM states "
+                "ORDER BY used DESC LIMIT -1 OFFSET ?)", (self.size,)
+            )
+            self._db.commit()
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM states").fetchone()[0]
+
+
+def hash_key(text):
+    """Return 64-bit hash of `text`, as stored on disk"""
+    digest = hashlib.sha1(text.encode("utf-8")).digest()
+    return struct.unpack(str("<q"), digest[:8])[0]
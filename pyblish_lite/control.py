@@ -8,7 +8,26 @@ an active window manager; such as via Travis-CI.
 
 """
 
+import hashlib
+import importlib
+import inspect
+import logging
+import math
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+import time
 import traceback
+import types
+from multiprocessing.pool import ThreadPool
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
 
 from .vendor.Qt import QtCore
 
@@ -17,7 +36,15 @@ import pyblish.lib
 import pyblish.util
 import pyblish.logic
 
-from . import util
+from . import cache, schedule, settings, trace, util
+from .vendor.six import exec_, text_type
+from .vendor.six.moves import queue
+
+log = logging.getLogger(__name__)
+
+# Modification time and size of each file of plug-ins
+# loaded in this process, when a process of the pool.
+_remote_modules = dict()
 
 
 class Controller(QtCore.QObject):
@@ -38,6 +65,13 @@ class Controller(QtCore.QObject):
     # Emitted when processing has finished
     was_finished = QtCore.Signal()
 
+    # Emitted with the traceback of an unexpected error,
+    # having interrupted processing.
+    was_interrupted = QtCore.Signal(object)
+
+    # Carries a callable from the worker thread to the GUI thread
+    _marshalled = QtCore.Signal(object)
+
     def __init__(self, parent=None):
         super(Controller, self).__init__(parent)
 
@@ -49,9 +83,39 @@ class Controller(QtCore.QObject):
 
         # Transient state used during publishing.
         self.pair_generator = None        # Active producer of pairs
+        self.schedule = None              # Plug-ins and their instances
         self.current_pair = (None, None)  # Active pair
         self.current_error = None
 
+        # Pool of processes for extractors, created on first use
+        self._process_pool = None
+
+        # Results of validation, reused for instances whose
+        # data remains unchanged since last being validated.
+        self._validations = dict()
+        self._validations_used = dict()
+        self._plugin_hashes = dict()
+        self._instance_hashes = dict()
+
+        # Passing results of validation persisted on disk,
+        # opened on first use, see `settings.ValidationCache`
+        self.validation_cache = None
+
+        # Timeline of publishing, created on first
+        # use, see `settings.TracePath`
+        self.tracer = None
+
+        # Modules of plug-ins, along with the size and time
+        # of modification of their file when last discovered.
+        self._modules = dict()
+        self._discovered_hosts = None
+
+        # Plug-ins with main thread affinity are processed here,
+        # when the remainder is processed in a worker thread.
+        self._main_thread = threading.current_thread().ident
+        self._marshalled.connect(self._on_marshalled,
+                                 QtCore.Qt.QueuedConnection)
+
         # This is used to track whether or not to continue
         # processing when, for example, validation has failed.
         self.processing = {
@@ -61,12 +125,19 @@ class Controller(QtCore.QObject):
 
     def reset(self):
         """Discover plug-ins and run collection"""
+
+        # The timeline covers the current scene, as opposed to
+        # growing, and being written, for the entire session.
+        if self.tracer is not None:
+            self.tracer.clear()
+
         self.context = pyblish.api.Context()
-        self.plugins = pyblish.api.discover()
+        self.plugins = self._discover()
 
         self.was_discovered.emit()
 
         self.pair_generator = None
+        self.schedule = None
         self.current_pair = (None, None)
         self.current_error = None
 
@@ -75,9 +146,22 @@ class Controller(QtCore.QObject):
             "ordersWithError": set()
         }
 
+        # Forget results no longer relevant to the current scene
+        if self._validations_used:
+            self._validations = self._validations_used
+            self._validations_used = dict()
+
+        self._plugin_hashes.clear()
+
         self._load()
+
+        # Collection runs in the GUI thread regardless of
+        # settings.WorkerThread, as the GUI prepares the data
+        # of each instance as it is being collected.
         self._run(until=pyblish.api.CollectorOrder,
-                  on_finished=self.was_reset.emit)
+                  on_finished=self.was_reset.emit,
+                  name="reset",
+                  threaded=False)
 
     def validate(self):
         # The iterator doesn't sync with the GUI check states so
@@ -85,7 +169,8 @@ class Controller(QtCore.QObject):
         # assuming the plugins are already sorted from api.Discover()
         self._reset_iterator(start_from=pyblish.api.ValidatorOrder)
         self._run(until=pyblish.api.ValidatorOrder,
-                  on_finished=self.on_validated)
+                  on_finished=self.on_validated,
+                  name="validate")
 
     def publish(self):
         plugin = self.current_pair[0]
@@ -93,7 +178,7 @@ class Controller(QtCore.QObject):
             # The iterator doesn't sync with the GUI check states so
             # reset the iterator to ensure we grab the updated instances
             self._reset_iterator(start_from=plugin.order)
-        self._run(on_finished=self.on_published)
+        self._run(on_finished=self.on_published, name="publish")
 
     def on_validated(self):
         pyblish.api.emit("validated", context=self.context)
@@ -107,24 +192,156 @@ class Controller(QtCore.QObject):
         context = self.context
 
         def on_next():
-            result = pyblish.plugin.process(plugin, context, None, action.id)
+            started = time.time()
+            result = _process_measured(plugin, context, None, action.id)
+            self._trace(result, started)
+
             self.was_acted.emit(result)
 
-        util.defer(100, on_next)
+            if self.tracer is not None:
+                self.tracer.span("act", started)
+                self.tracer.save(settings.TracePath)
+
+        util.next_tick(on_next)
+
+    def tracing(self):
+        """Return Tracer when tracing, see `settings.TracePath`"""
+        if not settings.TracePath:
+            return None
+
+        if self.tracer is None:
+            self.tracer = trace.Tracer()
+
+        return self.tracer
+
+    def _trace(self, result, started):
+        """Record the processing of `result` from `started`, if tracing"""
+        if self.tracer is None:
+            return
+
+        plugin = result["plugin"]
+        instance = result["instance"]
+
+        name = plugin.__name__
+        if instance is not None:
+            name += " (%s)" % instance.data["name"]
+
+        self.tracer.span(name, started, category="pair", args={
+            "order": plugin.order,
+            "success": result["success"],
+            "duration": result.get("duration"),
+            "cpu_duration": result.get("cpu_duration"),
+            "memory": result.get("memory"),
+        })
+
+    def slowest(self, count=10):
+        """Return results of the `count` slowest pairs processed
+
+        Arguments:
+            count (int, optional): Maximum number of results
+
+        """
+
+        results = self.context.data.get("results", [])
+        results = [result for result in results if result.get("duration")]
+        results.sort(key=lambda result: result["duration"], reverse=True)
+
+        return results[:count]
 
     def emit_(self, signal, kwargs):
         pyblish.api.emit(signal, **kwargs)
 
+    def _discover(self):
+        """Return plug-ins the way pyblish.api.discover() does
+
+        Except modules are only executed when their file has changed
+        since last being discovered, as executing every module on every
+        reset is slow, in particular from network shares.
+
+        """
+
+        if not settings.CacheDiscovery:
+            return pyblish.api.discover()
+
+        # Compatibility of plug-ins depend on registered hosts
+        hosts = pyblish.api.registered_hosts()
+        if hosts != self._discovered_hosts:
+            self._discovered_hosts = hosts
+            self._modules.clear()
+
+        allow_duplicates = getattr(pyblish.plugin, "ALLOW_DUPLICATES", False)
+        plugins = dict()
+        plugin_names = list()
+        modules = dict()
+
+        for path in pyblish.api.plugin_paths():
+            path = os.path.normpath(path)
+            if not os.path.isdir(path):
+                continue
+
+            for fname in os.listdir(path):
+                abspath = os.path.join(path, fname)
+
+                if fname.startswith("_"):
+                    continue
+
+                if not fname.endswith(".py") or not os.path.isfile(abspath):
+                    continue
+
+                key = _module_key(abspath)
+
+                module = self._modules.get(abspath)
+                if module is None or module[0] != key:
+                    module = (key, _plugins_from_file(abspath))
+
+                modules[abspath] = module
+
+                for plugin in module[1]:
+                    if not allow_duplicates and plugin.__name__ in plugin_names:
+                        continue
+
+                    plugin_names.append(plugin.__name__)
+
+                    # Hand out copies, as plug-ins are
+                    # modified by the GUI during publishing.
+                    copy = type(plugin.__name__, (plugin,), {})
+                    copy._id = plugin._id
+                    copy.__doc__ = plugin.__doc__
+                    copy.__module__ = plugin.__module__
+
+                    name = "{0}.{1}".format(plugin.__module__, plugin.__name__)
+                    plugins[name] = copy
+
+        # Forget modules no longer found
+        self._modules = modules
+
+        # Directly registered plug-ins take precedence.
+        for plugin in pyblish.api.registered_plugins():
+            if not allow_duplicates and plugin.__name__ in plugin_names:
+                continue
+
+            plugin_names.append(plugin.__name__)
+            plugins[plugin.__name__] = plugin
+
+        plugins = list(plugins.values())
+        pyblish.plugin.sort(plugins)
+
+        for filter_ in getattr(pyblish.plugin,
+                               "_registered_plugin_filters", []):
+            filter_(plugins)
+
+        return plugins
+
     def _load(self):
         """Initiate new generator and load first pair"""
         self.is_running = True
-        self.pair_generator = self._iterator(self.plugins,
-                                             self.context)
+        self.schedule = schedule.Schedule(self.plugins, self.context)
+        self.pair_generator = self._iterator(self.schedule)
         self.current_pair = next(self.pair_generator, (None, None))
         self.current_error = None
         self.is_running = False
 
-    def _process(self, plugin, instance=None):
+    def _process(self, plugin, instance=None, threaded=False):
         """Produce `result` from `plugin` and `instance`
 
         :func:`process` shares state with :func:`_iterator` such that
@@ -134,40 +351,200 @@ class Controller(QtCore.QObject):
             plugin (pyblish.api.Plugin): Produce result using plug-in
             instance (optional, pyblish.api.Instance): Process this instance,
                 if no instance is provided, context is processed.
+            threaded (bool, optional): Whether other pairs are processed
+                alongside this one, in other threads
 
         """
 
         self.processing["nextOrder"] = plugin.order
+        started = time.time()
+
+        key = self._validation_key(plugin, instance)
+        cached = None
+
+        if key and settings.IncrementalValidation:
+            cached = self._validations.get(key)
+
+        if key and cached is None and settings.ValidationCache:
+            cached = self._cached_validation(key)
+
+        if cached is not None:
+            # Records are shared with every reuse of this result,
+            # whose cost was paid once by the original result.
+            result = dict(cached,
+                          plugin=plugin,
+                          instance=instance,
+                          context=self.context,
+                          records=list(cached["records"]),
+                          duration=0,
+                          cpu_duration=0,
+                          memory=0)
+
+            if result["error"] is not None:
+                self.processing["ordersWithError"].add(plugin.order)
+
+            # As though processed, for integrators and callbacks
+            self.context.data.setdefault("results", list()).append(result)
+            pyblish.api.emit("pluginProcessed", result=result)
+
+            self._validations_used[key] = cached
+            self._trace(result, started)
+            return result
 
         try:
-            result = pyblish.plugin.process(plugin, self.context, instance)
+            if getattr(plugin, "main_thread", False):
+                result = self._call_in_main_thread(
+                    lambda: _process_measured(
+                        plugin, self.context, instance))
+            else:
+                result = _process_measured(plugin, self.context, instance)
 
         except Exception as e:
             raise Exception("Unknown error: %s" % e)
 
         else:
+            if threaded:
+                # Every thread listens in on the same global logger,
+                # only keep records produced by this particular pair.
+                ident = threading.current_thread().ident
+                result["records"][:] = [record
+                                        for record in result["records"]
+                                        if record.thread == ident]
+
             # Make note of the order at which the
             # potential error error occured.
             has_error = result["error"] is not None
             if has_error:
                 self.processing["ordersWithError"].add(plugin.order)
 
+            if key and settings.IncrementalValidation:
+                self._validations[key] = result
+                self._validations_used[key] = result
+
+            if key and settings.ValidationCache and result["success"]:
+                self._cache_validation(key, result)
+
+            self._trace(result, started)
+
         return result
 
-    def _run(self, until=float("inf"), on_finished=lambda: None):
-        """Process current pair and store next pair for next process
+    def _cached_validation(self, key):
+        """Return passing result of `key` from disk, or None"""
+        if self.validation_cache is None:
+            self.validation_cache = cache.ValidationCache(
+                settings.ValidationCachePath,
+                settings.ValidationCacheSize)
+
+        value = self.validation_cache.get(key)
+
+        if value is None:
+            return None
+
+        return {
+            "success": True,
+            "action": None,
+            "error": None,
+            # Messages are formatted already, though results cached
+            # by prior versions carry None rather than no arguments.
+            "records": [logging.makeLogRecord(dict(record, args=()))
+                        for record in value["records"]],
+            "duration": value["duration"],
+            "progress": 0,
+        }
+
+    def _cache_validation(self, key, result):
+        """Persist passing `result` of `key` to disk"""
+        self.validation_cache.set(key, result["plugin"].__name__, {
+            "records": [_record_snapshot(record)
+                        for record in result["records"]],
+            "duration": result["duration"],
+        })
+
+    def invalidate_validation_cache(self, plugin=None):
+        """Forget persisted results of validation
+
+        Arguments:
+            plugin (str, optional): Only forget results of plug-ins
+                of this name, defaults to forgetting all results
+
+        """
+
+        if self.validation_cache is None:
+            self.validation_cache = cache.ValidationCache(
+                settings.ValidationCachePath,
+                settings.ValidationCacheSize)
+
+        self.validation_cache.invalidate(plugin)
+
+    def _validation_key(self, plugin, instance):
+        """Return key of the result of validating `instance` with `plugin`
+
+        The key is made from the source code of the module of `plugin`
+        along with the data and members of `instance`, such that a
+        change to either
+        produces a different key. Returns None for pairs not considered
+        for reuse.
+
+        """
+
+        if instance is None:
+            return None
+
+        if not (settings.IncrementalValidation or settings.ValidationCache):
+            return None
+
+        if abs(plugin.order - pyblish.api.ValidatorOrder) > 0.5:
+            return None
+
+        if plugin not in self._plugin_hashes:
+            self._plugin_hashes[plugin] = _plugin_hash(plugin)
+
+        plugin_hash = self._plugin_hashes[plugin]
+        if plugin_hash is None:
+            return None
+
+        if instance.id not in self._instance_hashes:
+            self._instance_hashes[instance.id] = _instance_hash(instance)
+
+        return plugin_hash, self._instance_hashes[instance.id]
+
+    def _run(self, until=float("inf"), on_finished=lambda: None, name="run",
+             threaded=True):
+        """Process pairs in batches bounded by `settings.FrameBudget`
+
+        As many pairs as fit within the budget are processed per turn
+        of the event loop, after which Qt is given the chance to repaint
+        and handle user input, such as the Stop button.
 
         Arguments:
             until (pyblish.api.Order, optional): Keep fetching next()
                 until this order, default value is infinity.
             on_finished (callable, optional): What to do when finishing,
                 defaults to doing nothing.
+            name (str, optional): Label of run in the timeline,
+                see `settings.TracePath`
+            threaded (bool, optional): Whether to process in a worker
+                thread, given `settings.WorkerThread`
 
         """
 
+        tracer = self.tracing()
+        started = time.time()
+
+        # End of the previous turn of the event loop spent processing,
+        # such that the time spent elsewhere is shown as a gap.
+        ticked = [started]
+
+        budget = 0 if util.is_synchronous() else settings.FrameBudget
+        budget = (budget or 0) / 1000.0
+
+        # Instances may have changed since last being processed
+        self._instance_hashes.clear()
+
         def on_next():
+            """Process current pair and store the next; False when done"""
             if self.current_pair == (None, None):
-                return util.defer(100, on_finished_)
+                return False
 
             # The magic number 0.5 is the range between
             # the various CVEI processing stages;
@@ -179,29 +556,28 @@ class Controller(QtCore.QObject):
             #
             order = self.current_pair[0].order
             if order > (until + 0.5):
-                return util.defer(100, on_finished_)
+                return False
+
+            if self._is_dependent(self.current_pair[0]):
+                return on_next_graph()
+
+            if self._is_pooled(self.current_pair[0]):
+                return on_next_batch(self._process_pooled)
+
+            if self._is_threadsafe(self.current_pair[0]):
+                return on_next_batch(self._process_threaded)
 
             # The instance may have been disabled, check because the iterator will
             # have already provided it
             if self._current_pair_is_active():
                 self.about_to_process.emit(*self.current_pair)
 
-            util.defer(10, on_process)
+                result = self._process(*self.current_pair)
 
-        def on_process():
-            try:
-                if self._current_pair_is_active():
-                    result = self._process(*self.current_pair)
-
-                    if result["error"] is not None:
-                        self.current_error = result["error"]
+                if result["error"] is not None:
+                    self.current_error = result["error"]
 
-                    self.was_processed.emit(result)
-
-            except Exception as e:
-                stack = traceback.format_exc()
-                return util.defer(
-                    500, lambda: on_unexpected_error(error=stack))
+                self.was_processed.emit(result)
 
             # Now that processing has completed, and context potentially
             # modified with new instances, produce the next pair.
@@ -215,27 +591,425 @@ class Controller(QtCore.QObject):
             except StopIteration:
                 # All pairs were processed successfully!
                 self.current_pair = (None, None)
-                return util.defer(500, on_finished_)
+                return False
 
-            except Exception as e:
+            except Exception:
                 # This is a bug
-                stack = traceback.format_exc()
                 self.current_pair = (None, None)
-                return util.defer(
-                    500, lambda: on_unexpected_error(error=stack))
+                raise
+
+            return True
+
+        def on_next_batch(process):
+            """Process every instance of the current plug-in at once"""
+            plugin = self.current_pair[0]
+            plugins = self.schedule.plugins
+
+            index = plugins.index(plugin, self.schedule.seek(plugin.order))
+            pairs = [(plugin, instance)
+                     for instance in self.schedule.instances(index)
+                     if instance.data.get("publish") is not False]
+
+            for pair in pairs:
+                self.about_to_process.emit(*pair)
+
+            for result in process(pairs):
+                if result["error"] is not None:
+                    self.current_error = result["error"]
+
+                self.was_processed.emit(result)
+
+            # Continue from the next plug-in, given the instances
+            # and errors as they are once this batch has finished.
+            self.pair_generator = self._iterator(self.schedule, index + 1)
+
+            try:
+                self.current_pair = next(self.pair_generator)
+
+            except StopIteration:
+                self.current_pair = (None, None)
+                return False
+
+            except Exception:
+                self.current_pair = (None, None)
+                raise
+
+            return True
+
+        def on_next_graph():
+            """Process plug-ins declaring their data as a graph"""
+            plugin = self.current_pair[0]
+            plugins = self.schedule.plugins
+
+            start = plugins.index(plugin, self.schedule.seek(plugin.order))
+            end = start
+
+            # Plug-ins declaring their data, back-to-back within
+            # the current stage, e.g. collection, form a graph.
+            while (end < len(plugins) and
+                   self._is_dependent(plugins[end]) and
+                   plugins[end].order <= until + 0.5 and
+                   _stage(plugins[end].order) == _stage(plugin.order)):
+                end += 1
+
+            results = self._process_graph(
+                [plug for plug in plugins[start:end] if plug.active])
+
+            for result in results:
+                self.about_to_process.emit(result["plugin"],
+                                           result["instance"])
+
+            for result in results:
+                if result["error"] is not None:
+                    self.current_error = result["error"]
+
+                self.was_processed.emit(result)
+
+            # Continue from the first plug-in beyond the graph
+            self.pair_generator = self._iterator(self.schedule, end)
+
+            try:
+                self.current_pair = next(self.pair_generator)
+
+            except StopIteration:
+                self.current_pair = (None, None)
+                return False
 
-            util.defer(10, on_next)
+            except Exception:
+                self.current_pair = (None, None)
+                raise
+
+            return True
+
+        def on_tick():
+            tick = time.time()
+            deadline = tick + budget
+
+            if tracer is not None:
+                tracer.span("event loop", ticked[0], tick, category="gap")
+
+            try:
+                while on_next():
+                    if budget and time.time() > deadline:
+                        return on_yield(tick)
 
-        def on_unexpected_error(error):
-            util.u_print(u"An unexpected error occurred:\n %s" % error)
-            return util.defer(500, on_finished_)
+            except Exception:
+                on_error(traceback.format_exc())
+
+            on_finished_()
+
+        def on_yield(tick):
+            """Let Qt repaint and handle input prior to the next tick"""
+            if tracer is not None:
+                tracer.span("tick", tick, category="tick")
+                ticked[0] = time.time()
+
+            util.next_tick(on_tick)
+
+        def on_work():
+            try:
+                while on_next():
+                    pass
+
+            except Exception:
+                on_error(traceback.format_exc())
+
+            # Listeners expect to be called from the GUI thread
+            self._marshalled.emit(on_finished_)
+
+        def on_error(stack):
+            # Standard output may be reserved for results, as in headless
+            util.u_print(u"An unexpected error occurred:\n %s" % stack,
+                         file=sys.stderr)
+            self.was_interrupted.emit(stack)
 
         def on_finished_():
+            if self.validation_cache is not None:
+                self.validation_cache.flush()
+
+            if tracer is not None:
+                tracer.span(name, started)
+
             on_finished()
             self.was_finished.emit()
 
+            if tracer is not None:
+                tracer.save(settings.TracePath)
+
         self.is_running = True
-        util.defer(10, on_next)
+
+        if threaded and settings.WorkerThread and not util.is_synchronous():
+            worker = threading.Thread(target=on_work)
+            worker.daemon = True
+            worker.start()
+
+        else:
+            util.next_tick(on_tick)
+
+    def _call_in_main_thread(self, func):
+        """Call `func` in the GUI thread and wait for its return value
+
+        Arguments:
+            func (callable): Any callable
+
+        """
+
+        if threading.current_thread().ident == self._main_thread:
+            return func()
+
+        done = threading.Event()
+        output = {}
+
+        def call():
+            try:
+                output["value"] = func()
+            except Exception as e:
+                output["error"] = e
+            finally:
+                done.set()
+
+        self._marshalled.emit(call)
+        done.wait()
+
+        if "error" in output:
+            raise output["error"]
+
+        return output["value"]
+
+    def _on_marshalled(self, func):
+        func()
+
+    def _process_threaded(self, pairs):
+        """Produce results from `pairs` concurrently
+
+        Each pair is processed in a pool of `settings.ThreadPoolSize`
+        threads, and results are returned in the order of `pairs`.
+
+        Arguments:
+            pairs (list): Plug-in and instance pairs to process
+
+        """
+
+        if len(pairs) < 2:
+            return [self._process(*pair) for pair in pairs]
+
+        # Each process() lowers the level of the global logger once
+        # finished, which would silence pairs still running.
+        logger = logging.getLogger()
+        level = logger.level
+        logger.setLevel(logging.DEBUG)
+
+        pool = ThreadPool(settings.ThreadPoolSize)
+        processed = self.context.data.setdefault("results", list())
+        count = len(processed)
+
+        try:
+            results = pool.map(lambda pair: self._process_in_thread(*pair),
+                               pairs)
+
+        finally:
+            pool.close()
+            pool.join()
+            logger.setLevel(level)
+
+        # Appended as each thread finished, as opposed to in order
+        processed[count:] = results
+
+        return results
+
+    def _process_in_thread(self, plugin, instance=None):
+        """Produce `result` alongside other threads"""
+        return self._process(plugin, instance, threaded=True)
+
+    def _process_graph(self, plugins):
+        """Produce results from `plugins` as their data becomes available
+
+        Each plug-in is processed once every plug-in providing data
+        it requires has finished, concurrently with other plug-ins
+        whose data is available. Results are returned in the order
+        of `plugins`.
+
+        Arguments:
+            plugins (list): Plug-ins of one stage, sorted by order
+
+        """
+
+        dependencies = _dependencies(plugins)
+        finished = queue.Queue()
+        results = dict()
+
+        def process(plugin):
+            index = self.schedule.plugins.index(plugin)
+            output = list()
+
+            try:
+                if not plugin.__instanceEnabled__:
+                    output.append(self._process_in_thread(plugin))
+
+                else:
+                    for instance in self.schedule.instances(index):
+                        if instance.data.get("publish") is False:
+                            continue
+
+                        output.append(
+                            self._process_in_thread(plugin, instance))
+
+            finally:
+                # Dependants are waiting, even on a bug
+                finished.put((plugin, output))
+
+        logger = logging.getLogger()
+        level = logger.level
+        logger.setLevel(logging.DEBUG)
+
+        pool = ThreadPool(settings.ThreadPoolSize)
+        processed = self.context.data.setdefault("results", list())
+        count = len(processed)
+
+        try:
+            waiting = list(plugins)
+            pending = list()
+
+            while waiting or len(results) < len(plugins):
+                for plugin in list(waiting):
+                    if all(dependency in results
+                           for dependency in dependencies[plugin]):
+                        waiting.remove(plugin)
+                        pending.append(pool.apply_async(process, (plugin,)))
+
+                plugin, output = finished.get()
+                results[plugin] = output
+
+            # Re-raise errors of the pool itself, as
+            # opposed to those of plug-ins, in this thread
+            for result in pending:
+                result.get()
+
+        finally:
+            pool.close()
+            pool.join()
+            logger.setLevel(level)
+
+        results = [result
+                   for plugin in plugins
+                   for result in results[plugin]]
+
+        # Appended as each thread finished, as opposed to in order
+        processed[count:] = results
+
+        return results
+
+    def _process_pooled(self, pairs):
+        """Produce results from `pairs` in a pool of processes
+
+        Each instance is sent to the pool as a snapshot of its data,
+        and whatever data the plug-in produced is merged back into
+        the original instance once finished. Results are returned in
+        the order of `pairs`.
+
+        Arguments:
+            pairs (list): Plug-in and instance pairs to process
+
+        """
+
+        if not pairs:
+            return []
+
+        plugin = pairs[0][0]
+        self.processing["nextOrder"] = plugin.order
+
+        if self._process_pool is None:
+            executable = _pool_executable()
+
+            if executable != sys.executable:
+                multiprocessing.set_executable(executable)
+
+            self._process_pool = multiprocessing.Pool(
+                settings.ProcessPoolSize or None)
+
+        module = _plugin_module(plugin)
+        context = _snapshot(self.context.data)
+        key = _module_key(module)
+        payloads = [{"module": module,
+                     "key": key,
+                     "plugin": plugin.__name__,
+                     "context": context,
+                     "name": instance.data["name"],
+                     "data": _snapshot(instance.data),
+                     "members": list(instance)}
+                    for plugin, instance in pairs]
+
+        results = list()
+        started = time.time()
+        outputs = self._process_pool.map(_process_remote, payloads)
+
+        if self.tracer is not None:
+            self.tracer.span("%s (%d instances)" % (plugin.__name__,
+                                                    len(pairs)),
+                             started, category="pair",
+                             args={"order": plugin.order})
+
+        for (plugin, instance), output in zip(pairs, outputs):
+
+            instance.data.update(output["data"])
+
+            error = output["error"]
+            if error is not None:
+                exception = Exception(error["message"])
+                exception.traceback = error["traceback"]
+                exception.formatted_traceback = error["formatted_traceback"]
+                error = exception
+
+                self.processing["ordersWithError"].add(plugin.order)
+
+            result = {
+                "success": output["success"],
+                "plugin": plugin,
+                "instance": instance,
+                "action": None,
+                "error": error,
+                "records": [logging.makeLogRecord(record)
+                            for record in output["records"]],
+                "duration": output["duration"],
+                "cpu_duration": output["cpu_duration"],
+                "memory": output["memory"],
+                "progress": 0,
+                "context": self.context,
+            }
+
+            self.context.data.setdefault("results", list()).append(result)
+            pyblish.api.emit("pluginProcessed", result=result)
+
+            results.append(result)
+
+        return results
+
+    def _is_pooled(self, plugin):
+        """Can instances of `plugin` be extracted in another process?"""
+        return (getattr(plugin, "multiprocess", False) and
+                getattr(plugin, "__instanceEnabled__", False) and
+                abs(plugin.order - pyblish.api.ExtractorOrder) <= 0.5 and
+                _plugin_module(plugin) is not None and
+                not getattr(plugin, "main_thread", False) and
+                _pool_executable() is not None)
+
+    def _is_dependent(self, plugin):
+        """Does `plugin` declare which data it requires or provides?"""
+        return ((getattr(plugin, "requires_data", None) or
+                 getattr(plugin, "provides_data", None)) and
+                not getattr(plugin, "main_thread", False))
+
+    def _is_threadsafe(self, plugin):
+        """Can instances of `plugin` be processed concurrently?
+
+        Plug-ins bound to the main thread are not, as the main thread
+        would be waiting on the threads waiting on it.
+
+        """
+
+        return (getattr(plugin, "threadsafe", False) and
+                getattr(plugin, "__instanceEnabled__", False) and
+                not getattr(plugin, "main_thread", False))
 
     def _current_pair_is_active(self):
         return self.current_pair[1] is None or self.current_pair[1].data.get("publish", True)
@@ -243,32 +1017,31 @@ class Controller(QtCore.QObject):
     def _reset_iterator(self, start_from=-float("inf")):
         self.is_running = True
         self.pair_generator = self._iterator(
-            self.plugins,
-            self.context,
-                                             
+            self.schedule,
+
             # Minus 0.5, because each order is a range of values,
             # from -0.5 to 0.5. E.g. ExtractorOrder is 2, and spans
             # between 1.5-2.5
-            start_from - 0.5
+            self.schedule.seek(start_from - 0.5)
         )
 
         self.current_pair = next(self.pair_generator, (None, None))
         self.is_running = False
 
-    def _iterator(self, plugins, context, start_from=-float("inf")):
+    def _iterator(self, schedule, start=0):
         """Yield next plug-in and instance to process.
 
         Arguments:
-            plugins (list): Plug-ins to process
-            context (pyblish.api.Context): Context to process
+            schedule (Schedule): Plug-ins and instances to process
+            start (int, optional): Index of first plug-in to process
 
         """
         test = pyblish.logic.registered_test()
 
-        for plug, instance in pyblish.logic.Iterator(plugins, context):
-            order = plug.order
-
-            if order < start_from or not plug.active:
+        # Instances of plug-ins declaring their data are gathered
+        # once processed, as their data may create them.
+        for plug, instance in schedule.pairs(start, self._is_dependent):
+            if not plug.active:
                 continue
 
             if instance is not None and instance.data.get("publish") is False:
@@ -276,12 +1049,13 @@ class Controller(QtCore.QObject):
 
             self.processing["nextOrder"] = plug.order
 
+            # Returning, as opposed to raising StopIteration,
+            # as generators may no longer raise it (PEP 479)
             if not self.is_running:
-                raise StopIteration("Stopped")
+                return
 
             if test(**self.processing):
-                raise StopIteration("Stopped due to %s" % test(
-                    **self.processing))
+                return
 
             yield plug, instance
 
@@ -307,3 +1081,322 @@ class Controller(QtCore.QObject):
 
         for plugin in self.plugins:
             del(plugin)
+
+        if self._process_pool is not None:
+            self._process_pool.terminate()
+            self._process_pool = None
+
+        if self.validation_cache is not None:
+            self.validation_cache.close()
+            self.validation_cache = None
+
+
+def _plugin_module(plugin):
+    """Return file or module from which `plugin` may be imported
+
+    Plug-ins discovered from a path carry the path to their file, whereas
+    registered plug-ins are copies of a class defined in some module.
+    Returns None for plug-ins that cannot be imported from elsewhere,
+    such as those defined within a function.
+
+    """
+
+    for cls in plugin.__mro__:
+        if cls.__name__ != plugin.__name__:
+            break
+
+        if os.path.isfile(cls.__module__):
+            return cls.__module__
+
+        module = sys.modules.get(cls.__module__)
+        if getattr(module, cls.__name__, None) is cls:
+            return cls.__module__
+
+
+def _pool_executable():
+    """Return the interpreter of processes of the pool, None if unknown
+
+    Processes started afresh, as on Windows and macOS, run the current
+    executable, which within a host such as Maya is the host itself
+    rather than Python. Such hosts need `settings.ProcessPoolExecutable`.
+
+    """
+
+    if settings.ProcessPoolExecutable:
+        return settings.ProcessPoolExecutable
+
+    try:
+        method = multiprocessing.get_start_method()
+    except AttributeError:
+        # Python 2
+        method = "spawn" if os.name == "nt" else "fork"
+
+    # Forked processes run no executable of their own
+    name = os.path.basename(sys.executable or "").lower()
+    if method == "fork" or name.startswith("python"):
+        return sys.executable
+
+    return None
+
+
+def _process_measured(plugin, context, instance=None, action=None):
+    """Process `plugin` like pyblish.plugin.process, measuring its cost
+
+    Alongside the wall time of `duration`, the result carries the CPU
+    time of the calling thread in milliseconds, `cpu_duration`, and how
+    many bytes the peak memory of the process grew by, `memory`, which
+    is None where unavailable.
+
+    """
+
+    memory = _peak_memory()
+    cpu = _cpu_time()
+
+    result = pyblish.plugin.process(plugin, context, instance, action)
+
+    result["cpu_duration"] = (_cpu_time() - cpu) * 1000  # ms
+    result["memory"] = (_peak_memory() - memory
+                        if memory is not None else None)
+
+    return result
+
+
+def _cpu_time():
+    """Return CPU time of the current thread, in seconds"""
+    for name in ("thread_time", "process_time", "clock"):
+        if hasattr(time, name):
+            return getattr(time, name)()
+
+
+def _peak_memory():
+    """Return peak resident memory of this process in bytes, or None"""
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Kilobytes, except on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _stage(order):
+    """Return CVEI stage of `order`, e.g. 1 for validation"""
+    return int(math.floor(order + 0.5))
+
+
+def _dependencies(plugins):
+    """Return plug-ins each of `plugins` wait for
+
+    A plug-in waits for every plug-in providing data it requires.
+    Should plug-ins wait on each other, a plug-in only waits for
+    those providing data prior to it in order.
+
+    Arguments:
+        plugins (list): Plug-ins, sorted by order
+
+    """
+
+    def providers(plugin, candidates):
+        required = set(getattr(plugin, "requires_data", None) or [])
+        return [candidate for candidate in candidates
+                if candidate is not plugin and
+                required & set(getattr(candidate, "provides_data",
+                                       None) or [])]
+
+    dependencies = dict((plugin, providers(plugin, plugins))
+                        for plugin in plugins)
+
+    # Test for cycles by visiting plug-ins whose dependencies
+    # have been visited, until no more plug-ins can be visited.
+    visited = set()
+    remaining = list(plugins)
+
+    while remaining:
+        ready = [plugin for plugin in remaining
+                 if all(dependency in visited
+                        for dependency in dependencies[plugin])]
+
+        if not ready:
+            log.warning("Cyclic dependency between %s, "
+                        "processing them in order", remaining)
+
+            return dict((plugin, providers(plugin, plugins[:index]))
+                        for index, plugin in enumerate(plugins))
+
+        visited.update(ready)
+        remaining = [plugin for plugin in remaining if plugin not in visited]
+
+    return dependencies
+
+
+def _load_module(path):
+    """Execute Python file at `path`, the way pyblish.api.discover() does
+
+    The module is stored in sys.modules under `path`, to avoid garbage
+    collection from collecting its global imports, such as `import os`.
+
+    """
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    module = types.ModuleType(name)
+    module.__file__ = path
+
+    with open(path, "rb") as f:
+        exec_(f.read(), module.__dict__)
+
+    sys.modules[path] = module
+    return module
+
+
+def _plugins_from_file(path):
+    """Return plug-ins of the Python file at `path`"""
+    try:
+        module = _load_module(path)
+
+    except Exception as e:
+        log.error("Skipped: \"%s\" (%s)", path, e)
+        return []
+
+    plugins = pyblish.plugin.plugins_from_module(module)
+
+    for plugin in plugins:
+        plugin.__module__ = path
+
+    return plugins
+
+
+def _plugin_hash(plugin):
+    """Return hash of the name and module source code of `plugin`
+
+    The whole module is hashed, as opposed to the class alone, as
+    constants and functions of the module affect the plug-in too.
+    Returns None for plug-ins whose source is unavailable.
+
+    """
+
+    for cls in plugin.__mro__:
+        if cls.__name__ != plugin.__name__:
+            break
+
+        try:
+            # Discovered plug-ins carry the path to their file
+            if os.path.isfile(cls.__module__):
+                with open(cls.__module__, "rb") as f:
+                    source = f.read()
+            else:
+                module = sys.modules[cls.__module__]
+                source = inspect.getsource(module).encode("utf-8")
+
+        except (IOError, OSError, TypeError, KeyError):
+            continue
+
+        source = plugin.__name__.encode("utf-8") + b"\n" + source
+        return hashlib.sha1(source).hexdigest()
+
+
+def _instance_hash(instance):
+    """Return hash of the data and members of `instance`
+
+    GUI-only data, prefixed with an underscore, along
+    with the toggled publish state are excluded.
+
+    """
+
+    data = sorted(
+        (key, value) for key, value in instance.data.items()
+        if not key.startswith("_") and key != "publish"
+    )
+
+    content = repr((data, list(instance)))
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def _snapshot(data):
+    """Return the picklable subset of `data`"""
+    snapshot = dict()
+
+    for key, value in data.items():
+        try:
+            pickle.dumps(value)
+        except Exception:
+            continue
+
+        snapshot[key] = value
+
+    return snapshot
+
+
+def _record_snapshot(record):
+    """Return the picklable subset of log `record`"""
+    try:
+        message = record.getMessage()
+    except Exception:
+        message = text_type(record.msg)
+
+    # Arguments are formatted into the message already, an empty
+    # tuple rather than None keeps formatting the message a no-op.
+    return _snapshot(dict(record.__dict__,
+                          msg=message,
+                          args=(),
+                          exc_info=None))
+
+
+def _module_key(module):
+    """Return modification time and size of file `module`, if a file"""
+    if not os.path.isfile(module):
+        return None
+
+    stat = os.stat(module)
+    return stat.st_mtime, stat.st_size
+
+
+def _process_remote(payload):
+    """Process `payload` from :func:`Controller._process_pooled`
+
+    This runs in a separate process, and so must only
+    receive and return data that can be pickled.
+
+    """
+
+    module = payload["module"]
+
+    if os.path.isfile(module):
+        # Processes outlive a reset, by which the file may have changed
+        if _remote_modules.get(module) != payload["key"]:
+            _load_module(module)
+            _remote_modules[module] = payload["key"]
+
+        plugin = getattr(sys.modules[module], payload["plugin"])
+        plugin.__module__ = module
+
+    else:
+        plugin = getattr(importlib.import_module(module), payload["plugin"])
+
+    context = pyblish.api.Context()
+    context.data.update(payload["context"])
+
+    instance = context.create_instance(payload["name"])
+    instance.data.update(payload["data"])
+    instance.extend(payload["members"])
+
+    result = _process_measured(plugin, context, instance)
+
+    records = [_record_snapshot(record) for record in result["records"]]
+
+    error = result["error"]
+    if error is not None:
+        error = {
+            "message": text_type(error),
+            "traceback": tuple(getattr(error, "traceback", None) or ()),
+            "formatted_traceback": getattr(error, "formatted_traceback", ""),
+        }
+
+    return {
+        "success": result["success"],
+        "duration": result["duration"],
+        "cpu_duration": result["cpu_duration"],
+        "memory": result["memory"],
+        "records": records,
+        "error": error,
+        "data": _snapshot(instance.data),
+    }
@@ -2,7 +2,7 @@ import platform
 
 from .vendor.Qt import QtWidgets, QtGui, QtCore
 
-from . import model
+from . import model, util
 from .awesome import tags as awesome
 
 colors = {
@@ -104,9 +104,18 @@ class Item(DPIStyledItemDelegate):
 
         assert label_rect.width() > 0
 
+        # Total duration of every pair processed, right-aligned
+        # alongside the action icon.
+        duration = index.data(model.Duration)
+        duration = util.format_duration(duration) if duration else ""
+        duration_rect = label_rect.adjusted(0, 0, -20 * self._dpi_scale, 0)
+        duration_width = (metrics.boundingRect(duration).width()
+                          if duration else 0)
+
         label = index.data(model.Label)
         label = metrics.elidedText(
-            label, QtCore.Qt.ElideRight, int(label_rect.width() - 20 * self._dpi_scale)
+            label, QtCore.Qt.ElideRight,
+            int(label_rect.width() - 20 * self._dpi_scale - duration_width)
         )
 
         font_color = colors["idle"]
@@ -117,6 +126,11 @@ class Item(DPIStyledItemDelegate):
         painter.setPen(QtGui.QPen(font_color))
         painter.drawText(label_rect, label)
 
+        # Draw duration
+        if duration:
+            painter.setPen(QtGui.QPen(colors["inactive"]))
+            painter.drawText(duration_rect, QtCore.Qt.AlignRight, duration)
+
         # Draw action icon
         if index.data(model.ActionIconVisible):
             painter.save()
@@ -214,6 +228,7 @@ class Artist(DPIStyledItemDelegate):
 
         duration_rect = QtCore.QRectF(content_rect)
         duration_rect.translate(content_rect.width() - 50, 0)
+        duration_rect.setWidth(50)
 
         label_font = fonts["h3"]
         label_metrics = QtGui.QFontMetrics(label_font)
@@ -274,6 +289,12 @@ class Artist(DPIStyledItemDelegate):
         painter.setPen(QtGui.QPen(colors["inactive"]))
         painter.drawText(families_rect, families)
 
+        # Draw duration
+        duration = index.data(model.Duration)
+        if duration:
+            painter.drawText(duration_rect, QtCore.Qt.AlignRight,
+                             util.format_duration(duration))
+
         # Draw checkbox
         pen = QtGui.QPen(check_color, 1)
         painter.setPen(pen)
@@ -0,0 +1,149 @@
+"""Publish without a graphical user interface
+
+The :class:`control.Controller` is driven the way the window drives it,
+resetting followed by publishing, except synchronously and without any
+widgets. Each processed pair is written as a line of JSON, such that it
+may be followed as it happens, or parsed once finished.
+
+This makes publishing possible where there is no window manager,
+such as on render nodes and during batch processing.
+
+Usage:
+    $ python -m pyblish_lite --headless --output results.jsonl
+
+"""
+
+import json
+import os
+import sys
+import time
+
+from . import control
+from .vendor.Qt import QtCore
+from .vendor.six import text_type
+
+
+def publish(stream=None):
+    """Reset and publish, writing each result to `stream`
+
+    Arguments:
+        stream (file, optional): Where to write results, one JSON
+            object per line, defaults to sys.stdout
+
+    Returns:
+        summary (dict): Success, along with counts and duration
+
+    """
+
+    stream = stream or sys.stdout
+
+    app = QtCore.QCoreApplication.instance()
+    app = app or QtCore.QCoreApplication(sys.argv)  # noqa
+
+    summary = {
+        "type": "summary",
+        "success": True,
+        "processed": 0,
+        "failed": 0,
+        "duration": 0.0,
+    }
+
+    def on_processed(result):
+        summary["processed"] += 1
+
+        if not result["success"]:
+            summary["success"] = False
+            summary["failed"] += 1
+
+        write(format_result(result))
+
+    def on_interrupted(stack):
+        summary["success"] = False
+
+        write({
+            "type": "error",
+            "message": u"An unexpected error occurred",
+            "traceback": stack,
+        })
+
+    def write(data):
+        stream.write(json.dumps(data) + "\n")
+        stream.flush()
+
+    ctrl = control.Controller()
+    ctrl.was_processed.connect(on_processed)
+    ctrl.was_interrupted.connect(on_interrupted)
+
+    # Process every pair synchronously, as there is no event loop
+    delay = os.environ.get("PYBLISH_DELAY")
+    os.environ["PYBLISH_DELAY"] = "0"
+
+    before = time.time()
+
+    try:
+        ctrl.reset()
+        ctrl.publish()
+
+        # Processing was interrupted by an unexpected error
+        if ctrl.current_pair != (None, None):
+            summary["success"] = False
+
+    finally:
+        ctrl.cleanup()
+
+        # Windows of the host remain asynchronous
+        if delay is None:
+            os.environ.pop("PYBLISH_DELAY")
+        else:
+            os.environ["PYBLISH_DELAY"] = delay
+
+    summary["duration"] = (time.time() - before) * 1000  # ms
+    write(summary)
+
+    return summary
+
+
+def format_result(result):
+    """Return JSON-compatible copy of `result`
+
+    Arguments:
+        result (dict): As produced by pyblish.plugin.process
+
+    """
+
+    plugin = result["plugin"]
+    instance = result["instance"]
+    error = result["error"]
+
+    records = list()
+    for record in result["records"]:
+        try:
+            message = text_type(record.msg) % record.args
+        except Exception:
+            message = text_type(record.msg)
+
+        records.append({
+            "levelname": record.levelname,
+            "name": record.name,
+            "message": message,
+        })
+
+    if error is not None:
+        error = {
+            "message": text_type(error),
+            "traceback": getattr(error, "formatted_traceback", None),
+        }
+
+    return {
+        "type": "result",
+        "plugin": plugin.__name__,
+        "label": getattr(plugin, "label", None) or plugin.__name__,
+        "order": plugin.order,
+        "instance": instance.data["name"] if instance is not None else None,
+        "success": result["success"],
+        "duration": result["duration"],
+        "cpu_duration": result.get("cpu_duration"),
+        "memory": result.get("memory"),
+        "records": records,
+        "error": error,
+    }
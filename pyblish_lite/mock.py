@@ -726,3 +726,55 @@ plugins = [
 ]
 
 pyblish.api.sort_plugins(plugins)
+
+
+def generate(plugins=10, instances=10, fanout=1, records=0, families=10):
+    """Return synthetic plug-ins, such as for benchmarks
+
+    A collector creates `instances`, each belonging to `fanout` of
+    `families`, followed by `plugins` validators and extractors, each
+    supporting one family and logging `records` messages per instance.
+
+    Arguments:
+        plugins (int, optional): Number of validators and extractors
+        instances (int, optional): Number of instances collected
+        fanout (int, optional): Number of families of each instance
+        records (int, optional): Messages logged per pair
+        families (int, optional): Number of families in total
+
+    """
+
+    names = ["family%d" % index for index in range(families)]
+
+    class CollectSynthetic(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for index in range(instances):
+                context.create_instance(
+                    "Synthetic%d" % index,
+                    family=names[index % families],
+                    families=[names[(index + offset) % families]
+                              for offset in range(1, fanout)]
+                )
+
+    def process(self, instance):
+        for index in range(self.records):
+            self.log.info("Message %d of %s", index, instance)
+
+    generated = [CollectSynthetic]
+
+    for index in range(plugins):
+        generated.append(type(
+            "Synthetic%d" % index,
+            (pyblish.api.InstancePlugin,),
+            {
+                "order": (pyblish.api.ValidatorOrder if index % 2
+                          else pyblish.api.ExtractorOrder),
+                "families": [names[index % families]],
+                "records": records,
+                "process": process,
+            }
+        ))
+
+    return generated
@@ -25,9 +25,10 @@ Roles:
 """
 from __future__ import unicode_literals
 
+import contextlib
 import logging
 
-from . import settings
+from . import records, settings, util
 from .awesome import tags as awesome
 from .vendor.Qt import QtCore, __binding__
 from .vendor.six import text_type
@@ -62,6 +63,8 @@ HasSucceeded = QtCore.Qt.UserRole + 7
 HasProcessed = QtCore.Qt.UserRole + 8
 HasWarning = QtCore.Qt.UserRole + 62
 Duration = QtCore.Qt.UserRole + 11
+CpuDuration = QtCore.Qt.UserRole + 18
+Memory = QtCore.Qt.UserRole + 19
 
 # PLUGINS
 
@@ -91,10 +94,34 @@ ExcFunc = QtCore.Qt.UserRole + 59
 ExcExc = QtCore.Qt.UserRole + 60
 
 
+def checkstate_key(index):
+    """Return key of the check state of item at `index`
+
+    Items of the same families and label share their
+    check state, e.g. across resets.
+
+    """
+
+    return "{families}.{label}".format(families=index.data(Families),
+                                       label=index.data(Label))
+
+
 class Abstract(QtCore.QAbstractListModel):
+    def __init__(self, parent=None):
+        super(Abstract, self).__init__(parent)
+
+        # Row of each item, by identity, as instances
+        # are lists and as such cannot be hashed.
+        self._rows = dict()
+
+        # Rows and roles changed during a transaction
+        self._transactions = 0
+        self._changed_rows = set()
+        self._changed_roles = set()
+
     def __iter__(self):
         """Yield each row of model"""
-        for index in range(len(self.items)):
+        for index in range(self.rowCount()):
             yield self.createIndex(index, 0)
 
     def data(self, index, role):
@@ -103,19 +130,106 @@ class Abstract(QtCore.QAbstractListModel):
 
     def append(self, item):
         """Append item to end of model"""
+        self.extend([item])
+
+    def extend(self, items):
+        """Append items to end of model, signalling their insertion once"""
+        items = [self.prepare(item) for item in items]
+
+        if not items:
+            return
+
+        first = self.rowCount()
         self.beginInsertRows(QtCore.QModelIndex(),
-                             self.rowCount(),
-                             self.rowCount())
+                             first,
+                             first + len(items) - 1)
+
+        for item in items:
+            self._rows[id(item)] = len(self.items)
+            self.items.append(item)
 
-        self.items.append(item)
         self.endInsertRows()
 
+    def prepare(self, item):
+        """Return `item` as stored in model, prior to being appended"""
+        return item
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Signal every change within as one, once finished
+
+        Example:
+            >>> model = Terminal()
+            >>> model.append({"label": "a"})
+            >>> model.append({"label": "b"})
+            >>> with model.transaction():
+            ...     for index in model:
+            ...         model.setData(index, "c", Label)
+
+        """
+
+        self._transactions += 1
+
+        try:
+            yield
+
+        finally:
+            self._transactions -= 1
+
+            if not self._transactions:
+                self.flush()
+
+    def changed(self, index, role):
+        """Signal change of `role` at `index`, or defer until flushed"""
+        if self._transactions:
+            self._changed_rows.add(index.row())
+            self._changed_roles.add(role)
+            return
+
+        if __binding__ in ("PyQt4", "PySide"):
+            self.dataChanged.emit(index, index)
+        else:
+            self.dataChanged.emit(index, index, [role])
+
+    def flush(self):
+        """Signal rows and roles changed, as one range of rows"""
+        if not self._changed_rows:
+            return
+
+        first = self.createIndex(min(self._changed_rows), 0)
+        last = self.createIndex(max(self._changed_rows), 0)
+        roles = sorted(self._changed_roles)
+
+        self._changed_rows.clear()
+        self._changed_roles.clear()
+
+        if __binding__ in ("PyQt4", "PySide"):
+            self.dataChanged.emit(first, last)
+        else:
+            self.dataChanged.emit(first, last, roles)
+
+    def row(self, item):
+        """Return row of `item`, without searching for it
+
+        Raises:
+            ValueError: When `item` is not in model, like list.index
+
+        """
+
+        try:
+            return self._rows[id(item)]
+        except KeyError:
+            raise ValueError("%r is not in model" % (item,))
+
     def rowCount(self, parent=None):
         return len(self.items)
 
     def reset(self):
         self.beginResetModel()
         self.items[:] = []
+        self._rows.clear()
+        self._changed_rows.clear()
+        self._changed_roles.clear()
         self.endResetModel()
 
     def update_with_result(self, result):
@@ -141,6 +255,8 @@ class Item(Abstract):
             # GUI-only data
             Type: "_type",
             Duration: "_duration",
+            CpuDuration: "_cpu_duration",
+            Memory: "_memory",
             IsIdle: "_is_idle",
             IsProcessing: "_is_processing",
             HasProcessed: "_has_processed",
@@ -148,26 +264,36 @@ class Item(Abstract):
             HasFailed: "_has_failed",
         }
 
+    def accumulate(self, index, result):
+        """Add the cost of `result` to the totals of `index`"""
+        for role, key in ((Duration, "duration"),
+                          (CpuDuration, "cpu_duration"),
+                          (Memory, "memory")):
+            value = result.get(key)
+
+            if value:
+                self.setData(index, (self.data(index, role) or 0) + value,
+                             role)
+
     def store_checkstate(self):
         self.checkstate.clear()
 
         for index in self:
-            label = index.data(Label)
-            families = index.data(Families)
-            uid = "{families}.{label}".format(**locals())
-            state = index.data(IsChecked)
-            self.checkstate[uid] = state
+            self.checkstate[checkstate_key(index)] = index.data(IsChecked)
 
     def restore_checkstate(self):
-        for index in self:
-            label = index.data(Label)
-            families = index.data(Families)
+        """Apply check states stored, signalled as one change"""
+        with self.transaction():
+            for index in self:
+                key = checkstate_key(index)
+
+                # Does it have a previous state?
+                if key not in self.checkstate:
+                    continue
 
-            # Does it have a previous state?
-            for uid, state in self.checkstate.items():
-                if uid == "{families}.{label}".format(**locals()):
+                state = self.checkstate[key]
+                if state != index.data(IsChecked):
                     self.setData(index, state, IsChecked)
-                    break
 
 
 class Plugin(Item):
@@ -182,7 +308,14 @@ class Plugin(Item):
             HasWarning: "_has_warning",
         })
 
-    def append(self, item):
+        # Actions and whether any are visible, by row and role
+        self._actions = dict()
+
+    def reset(self):
+        self._actions.clear()
+        super(Plugin, self).reset()
+
+    def prepare(self, item):
 
         item.label = item.label or item.__name__
         # Use class names if settings say so.
@@ -198,12 +331,17 @@ class Plugin(Item):
         item._has_warning = False
         item._type = "plugin"
 
+        # Totals of every pair processed
+        item._duration = 0.0
+        item._cpu_duration = 0.0
+        item._memory = 0
+
         item._action_idle = True
         item._action_processing = False
         item._action_succeeded = False
         item._action_failed = False
 
-        return super(Plugin, self).append(item)
+        return item
 
     def data(self, index, role):
         item = self.items[index.row()]
@@ -214,6 +352,27 @@ class Plugin(Item):
         if role == Icon:
             return awesome.get(getattr(item, "icon", ""))
 
+        if role in (Actions, ActionIconVisible):
+            key = (index.row(), role)
+
+            try:
+                value = self._actions[key]
+            except KeyError:
+                value = self._actions[key] = self._action_data(item, role)
+
+            # Actions are mutable, leave those remembered alone
+            return list(value) if role == Actions and value else value
+
+        key = self.schema.get(role)
+        value = getattr(item, key, None) if key is not None else None
+
+        if value is None:
+            value = super(Plugin, self).data(index, role)
+
+        return value
+
+    def _action_data(self, item, role):
+        """Compute `role` of actions of `item`, see data()"""
         if role == ActionIconVisible:
 
             # Can only run actions on active plug-ins.
@@ -294,14 +453,6 @@ class Plugin(Item):
 
             return actions
 
-        key = self.schema.get(role)
-        value = getattr(item, key, None) if key is not None else None
-
-        if value is None:
-            value = super(Plugin, self).data(index, role)
-
-        return value
-
     def setData(self, index, value, role):
         item = self.items[index.row()]
         key = self.schema.get(role)
@@ -311,29 +462,34 @@ class Plugin(Item):
 
         setattr(item, key, value)
 
-        if __binding__ in ("PyQt4", "PySide"):
-            self.dataChanged.emit(index, index)
-        else:
-            self.dataChanged.emit(index, index, [role])
+        # Actions available depend on these
+        if role in (IsChecked, HasFailed, HasWarning,
+                    HasSucceeded, HasProcessed):
+            self._actions.pop((index.row(), Actions), None)
+            self._actions.pop((index.row(), ActionIconVisible), None)
+
+        self.changed(index, role)
 
     def update_with_result(self, result, action=False):
         item = result["plugin"]
 
-        index = self.items.index(item)
-        index = self.createIndex(index, 0)
+        index = self.createIndex(self.row(item), 0)
         hasWarning = self.data(index, HasWarning)
         if not hasWarning:
             hasWarning = any([record.levelno == logging.WARNING for record in result["records"]])
 
-        self.setData(index, False, IsIdle)
-        self.setData(index, False, IsProcessing)
-        self.setData(index, hasWarning, HasWarning)
-        self.setData(index, True, HasProcessed)
-        self.setData(index, result["success"], HasSucceeded)
+        with self.transaction():
+            self.setData(index, False, IsIdle)
+            self.setData(index, False, IsProcessing)
+            self.setData(index, hasWarning, HasWarning)
+            self.setData(index, True, HasProcessed)
+            self.setData(index, result["success"], HasSucceeded)
 
-        # Once failed, never go back.
-        if not self.data(index, HasFailed):
-            self.setData(index, not result["success"], HasFailed)
+            # Once failed, never go back.
+            if not self.data(index, HasFailed):
+                self.setData(index, not result["success"], HasFailed)
+
+            self.accumulate(index, result)
 
         super(Plugin, self).update_with_result(result)
 
@@ -342,7 +498,7 @@ class Instance(Item):
     def __init__(self):
         super(Instance, self).__init__()
 
-        self.ids = []
+        self.ids = set()
         self.schema.update({
             IsChecked: "publish",
 
@@ -350,7 +506,7 @@ class Instance(Item):
             Families: "__families__",
         })
 
-    def append(self, item):
+    def prepare(self, item):
         item.data["optional"] = item.data.get("optional", True)
         item.data["publish"] = item.data.get("publish", True)
 
@@ -360,7 +516,7 @@ class Instance(Item):
             item.data["label"] = item.data["name"]
 
         # Store instances id in easy access data member
-        self.ids.append(item.id)
+        self.ids.add(item.id)
 
         # GUI-only data
         item.data["_type"] = "instance"
@@ -368,11 +524,16 @@ class Instance(Item):
         item.data["_has_failed"] = False
         item.data["_is_idle"] = True
 
+        # Totals of every pair processed
+        item.data["_duration"] = 0.0
+        item.data["_cpu_duration"] = 0.0
+        item.data["_memory"] = 0
+
         # Merge `family` and `families` for backwards compatibility
         item.data["__families__"] = ([item.data["family"]] +
                                      item.data.get("families", []))
 
-        return super(Instance, self).append(item)
+        return item
 
     def data(self, index, role):
         item = self.items[index.row()]
@@ -400,10 +561,7 @@ class Instance(Item):
 
         item.data[key] = value
 
-        if __binding__ in ("PyQt4", "PySide"):
-            self.dataChanged.emit(index, index)
-        else:
-            self.dataChanged.emit(index, index, [role])
+        self.changed(index, role)
 
     def update_with_result(self, result):
         item = result["instance"]
@@ -411,25 +569,37 @@ class Instance(Item):
         if item is None:
             return
 
-        index = self.items.index(item)
-        index = self.createIndex(index, 0)
+        index = self.createIndex(self.row(item), 0)
 
-        self.setData(index, False, IsIdle)
-        self.setData(index, False, IsProcessing)
-        self.setData(index, True, HasProcessed)
-        self.setData(index, result["success"], HasSucceeded)
+        with self.transaction():
+            self.setData(index, False, IsIdle)
+            self.setData(index, False, IsProcessing)
+            self.setData(index, True, HasProcessed)
+            self.setData(index, result["success"], HasSucceeded)
 
-        # Once failed, never go back.
-        if not self.data(index, HasFailed):
-            self.setData(index, not result["success"], HasFailed)
+            # Once failed, never go back.
+            if not self.data(index, HasFailed):
+                self.setData(index, not result["success"], HasFailed)
+
+            self.accumulate(index, result)
 
         super(Instance, self).update_with_result(result)
 
 
 class Terminal(Abstract):
+    """Records of the terminal, the newest of which are kept in memory
+
+    Beyond settings.TerminalCapacity, the oldest records in memory
+    are moved to an archive on disk a page at a time, and are read
+    back as they are scrolled to. Changes to archived records are
+    only kept while their page remains in memory.
+
+    """
+
     def __init__(self, parent=None):
         super(Terminal, self).__init__(parent)
         self.items = list()
+        self.archive = records.Archive()
 
         # Common schema
         self.schema = {
@@ -453,8 +623,56 @@ class Terminal(Abstract):
             ExcExc: "exc",
         }
 
+    def item(self, row):
+        """Return record at `row`, reading it from disk if archived"""
+        archived = len(self.archive)
+
+        if row < archived:
+            return self.archive[row]
+
+        return self.items[row - archived]
+
+    def prepare(self, item):
+        if isinstance(item, dict):
+            item = records.Record(**item)
+
+        return item
+
+    def extend(self, items):
+        items = [self.prepare(item) for item in items]
+
+        if not items:
+            return
+
+        # Rows of records are not kept, as records are archived
+        first = self.rowCount()
+        self.beginInsertRows(QtCore.QModelIndex(),
+                             first,
+                             first + len(items) - 1)
+        self.items.extend(items)
+        self.endInsertRows()
+
+        capacity = settings.TerminalCapacity
+        page_size = self.archive.page_size
+
+        # Archive whole pages, oldest first
+        while capacity and len(self.items) >= capacity + page_size:
+            self.archive.extend(self.items[:page_size])
+            del self.items[:page_size]
+
+    def rowCount(self, parent=None):
+        return len(self.archive) + len(self.items)
+
+    def reset(self):
+        self.beginResetModel()
+        self.items[:] = []
+        self.archive.close()
+        self._changed_rows.clear()
+        self._changed_roles.clear()
+        self.endResetModel()
+
     def data(self, index, role):
-        item = self.items[index.row()]
+        item = self.item(index.row())
 
         if role == Data:
             return item
@@ -472,7 +690,7 @@ class Terminal(Abstract):
         return value
 
     def setData(self, index, value, role):
-        item = self.items[index.row()]
+        item = self.item(index.row())
         key = self.schema.get(role)
 
         if key is None:
@@ -480,41 +698,44 @@ class Terminal(Abstract):
 
         item[key] = value
 
-        if __binding__ in ("PyQt4", "PySide"):
-            self.dataChanged.emit(index, index)
-        else:
-            self.dataChanged.emit(index, index, [role])
+        self.changed(index, role)
 
     def update_with_result(self, result):
+        items = list()
+
         for record in result["records"]:
             if record.levelno < settings.TerminalLoglevel:
                 continue
-            self.append({
-                "label": text_type(record.msg) % record.args,
-                "type": "record",
+            # Formatted once looked at
+            items.append(records.Record(
+                args=record.args,
+                type="record",
 
                 # Native
-                "threadName": record.threadName,
-                "name": record.name,
-                "filename": record.filename,
-                "pathname": record.pathname,
-                "lineno": record.lineno,
-                "msg": record.msg,
-                "msecs": record.msecs,
-                "levelname": record.levelname,
-            })
+                threadName=record.threadName,
+                name=record.name,
+                filename=record.filename,
+                pathname=record.pathname,
+                lineno=record.lineno,
+                msg=record.msg,
+                msecs=record.msecs,
+                levelname=record.levelname,
+            ))
 
         error = result["error"]
         if error is not None:
             fname, line_no, func, exc = error.traceback
-            self.append({
-                "label": text_type(error),
-                "type": "error",
-                "fname": fname,
-                "line_number": line_no,
-                "func": func,
-                "exc": exc,
-            })
+            items.append(records.Record(
+                label=text_type(error),
+                type="error",
+                fname=fname,
+                line_number=line_no,
+                func=func,
+                exc=exc,
+            ))
+
+        # Inserted at once, rather than one record at a time
+        self.extend(items)
 
 
 class ProxyModel(QtCore.QSortFilterProxyModel):
@@ -543,7 +764,22 @@ class ProxyModel(QtCore.QSortFilterProxyModel):
         self.setSourceModel(source)
 
         self.excludes = dict()
-        self.includes = {'families': ['*']}
+        self.includes = {'families': set(['*'])}
+
+        # Rows of source items, by role and value, such as
+        # {"families": {"*": {0, 1}, "model": {1}}}
+        self._index = dict()
+        self._indexed = 0
+
+        # Rows accepted by includes, None when yet to be computed
+        self._included = None
+
+        # Rules change many times per pair processed,
+        # only filter once per turn of the event loop.
+        self._is_invalidating = False
+
+        if source is not None:
+            source.modelAboutToBeReset.connect(self._clear_index)
 
     def item(self, index):
         index = self.index(index, 0, QtCore.QModelIndex())
@@ -553,7 +789,8 @@ class ProxyModel(QtCore.QSortFilterProxyModel):
 
     def reset(self):
         self.beginResetModel()
-        self.includes = {'families': ['*']}
+        self.includes = {'families': set(['*'])}
+        self._included = None
         self.endResetModel()
 
     def add_exclusion(self, role, value):
@@ -617,12 +854,27 @@ class ProxyModel(QtCore.QSortFilterProxyModel):
 
     def _add_rule(self, group, role, value):
         """Implementation detail"""
-        if role not in group:
-            group[role] = list()
+        values = group.setdefault(role, set())
+
+        if value in values:
+            return
+
+        values.add(value)
+
+        if group is self.includes:
+            if self._included is not None and role == next(iter(group)):
+                rows = self._rows(role).get(value, set()) - self._included
+
+                # Only rows not already included are affected
+                if not rows:
+                    return
+
+                self._included.update(rows)
 
-        group[role].append(value)
+            else:
+                self._included = None
 
-        self.invalidate()
+        self._invalidate_later()
 
     def _remove_rule(self, group, role, value=None):
         """Implementation detail"""
@@ -632,23 +884,105 @@ class ProxyModel(QtCore.QSortFilterProxyModel):
         if value is None:
             group.pop(role, None)
         else:
-            group[role].remove(value)
+            group[role].discard(value)
+
+        if group is self.includes:
+            self._included = None
 
-        self.invalidate()
+        self._invalidate_later()
 
     def _set_rules(self, group, rules):
         """Implementation detail"""
         group.clear()
 
+        if group is self.includes:
+            self._included = None
+
         for rule in rules:
             self._add_rule(group, *rule)
 
-        self.invalidate()
+        self._invalidate_later()
 
     def _clear_group(self, group):
         group.clear()
 
-        self.invalidate()
+        if group is self.includes:
+            self._included = None
+
+        self._invalidate_later()
+
+    def _invalidate_later(self):
+        """Filter once control returns to the event loop"""
+        if self._is_invalidating:
+            return
+
+        self._is_invalidating = True
+        util.next_tick(self._invalidate)
+
+    def _invalidate(self):
+        self._is_invalidating = False
+        self.invalidateFilter()
+
+    def _clear_index(self):
+        self._index.clear()
+        self._indexed = 0
+        self._included = None
+
+    def _values(self, item, role):
+        """Values of `item` for `role`, as matched against includes"""
+        return [value for value in getattr(item, role, None) or []
+                if not isinstance(value, (list, tuple))]
+
+    def _rows(self, role):
+        """Return rows of source items by value of `role`"""
+        try:
+            return self._index[role]
+
+        except KeyError:
+            rows = self._index[role] = dict()
+            items = self.sourceModel().items
+
+            for row in range(self._indexed):
+                for value in self._values(items[row], role):
+                    rows.setdefault(value, set()).add(row)
+
+            return rows
+
+    def _included_rows(self):
+        """Return rows of source items matching any include
+
+        Only the first role of includes is considered.
+
+        """
+
+        items = self.sourceModel().items
+
+        # Index items appended since last time
+        for row in range(self._indexed, len(items)):
+            for role, rows in self._index.items():
+                for value in self._values(items[row], role):
+                    rows.setdefault(value, set()).add(row)
+
+            if self._included is not None:
+                role = next(iter(self.includes))
+                if self.includes[role].intersection(
+                        self._values(items[row], role)):
+                    self._included.add(row)
+
+        self._indexed = len(items)
+
+        if self._included is None:
+            self._included = set()
+
+            for role, values in self.includes.items():
+                rows = self._rows(role)
+
+                for value in values.intersection(rows):
+                    self._included.update(rows[value])
+
+                break
+
+        return self._included
 
     # Overridden methods
 
@@ -664,15 +998,17 @@ class ProxyModel(QtCore.QSortFilterProxyModel):
                 return False if match == -1 else True
 
         # --- Check if any family assigned to the plugin is in allowed families
-        for role, values in self.includes.items():
-            includes_list = [([x] if isinstance(x, (list, tuple)) else x)
-                             for x in getattr(item, role, None)]
-            return any(include in values for include in includes_list)
+        if self.includes:
+            return source_row in self._included_rows()
 
         for role, values in self.excludes.items():
             data = getattr(item, role, None)
-            if data in values:
-                return False
+            try:
+                if data in values:
+                    return False
+            except TypeError:
+                # Unhashable, e.g. a list, never equal to any value
+                continue
 
         return super(ProxyModel, self).filterAcceptsRow(
             source_row, source_parent)
@@ -0,0 +1,237 @@
+"""Storage of records of the terminal
+
+Each record is a :class:`Record`, taking a fraction of the memory of a
+dict. The terminal keeps the newest records in memory, whereas older
+ones are written to an :class:`Archive` on disk, such that memory
+remains the same regardless of how much plug-ins log. Archived records
+are read back a page at a time once scrolled to, and are discarded
+along with the terminal.
+
+"""
+
+import collections
+import json
+import tempfile
+
+from .vendor.six import text_type
+
+
+class Record(object):
+    """Entry of the terminal, such as a log record or an exception
+
+    Behaves like a dict of those keys having a value, keys being
+    limited to those of the schema of the terminal.
+
+    The label of a log record is formatted from its message and `args`
+    once first accessed, as most records are never looked at.
+
+    Example:
+        >>> record = Record(label="Hello", type="info")
+        >>> record["label"]
+        'Hello'
+        >>> sorted(record)
+        ['label', 'type']
+        >>> record.get("lineno") is None
+        True
+        >>> Record(msg="Hello %s", args=("World",))["label"]
+        'Hello World'
+        >>> Record(msg="100%", args=None)["label"]
+        '100%'
+        >>> Record(msg="%s %s", args=("World",))["label"]
+        '%s %s'
+
+    """
+
+    _keys = (
+        "type",
+        "label",
+
+        # Log records
+        "threadName",
+        "name",
+        "filename",
+        "pathname",
+        "lineno",
+        "msg",
+        "msecs",
+        "levelname",
+
+        # Exceptions
+        "fname",
+        "line_number",
+        "func",
+        "exc",
+    )
+
+    __slots__ = tuple(key for key in _keys if key != "label") + (
+        "_label",
+        "_args",  # Of message, until formatted
+    )
+
+    def __init__(self, args=None, **data):
+        self._args = args
+
+        for key, value in data.items():
+            self[key] = value
+
+    @property
+    def label(self):
+        try:
+            return self._label
+        except AttributeError:
+            pass
+
+        # Like logging.LogRecord.getMessage, only formatting
+        # arguments if any, and raising AttributeError when
+        # there is no message to format.
+        label = text_type(self.msg)
+        args = self._args
+
+        if args:
+            try:
+                label = label % args
+
+            # Arguments not matching the message are a bug of the
+            # plug-in, shown as the message alone rather than raised
+            # on every repaint.
+            except Exception:
+                pass
+
+        self._label = label
+        del self._args
+
+        return label
+
+    @label.setter
+    def label(self, value):
+        self._label = value
+
+        try:
+            del self._args
+        except AttributeError:
+            pass
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self._keys:
+            raise KeyError(key)
+
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._keys and hasattr(self, key)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __repr__(self):
+        return "Record(%s)" % ", ".join(
+            "%s=%r" % item for item in self.items())
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return [key for key in self._keys if hasattr(self, key)]
+
+    def values(self):
+        return [getattr(self, key) for key in self.keys()]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+
+class Archive(object):
+    """Append-only file of records, read a page at a time
+
+    Records are written a page at a time, and each page is read
+    as a whole, the most recently read pages being kept in memory.
+
+    Arguments:
+        page_size (int, optional): Records per page
+        pages (int, optional): Pages kept in memory once read
+
+    Example:
+        >>> archive = Archive(page_size=2)
+        >>> archive.extend([Record(label="a"), Record(label="b")])
+        >>> len(archive)
+        2
+        >>> archive[1]["label"]
+        'b'
+        >>> archive.close()
+
+    """
+
+    def __init__(self, page_size=100, pages=10):
+        self.page_size = page_size
+
+        self._file = None
+        self._offsets = list()  # Of each page in file
+        self._pages = collections.OrderedDict()
+        self._max_pages = pages
+
+    def __len__(self):
+        return len(self._offsets) * self.page_size
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError("Record %d is not archived" % index)
+
+        return self._page(index // self.page_size)[index % self.page_size]
+
+    def extend(self, records):
+        """Write a page of `records` to the end of the archive"""
+        assert len(records) == self.page_size, (
+            "Archive pages of %d records" % self.page_size)
+
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix="pyblish-lite-")
+
+        data = json.dumps([dict(record) for record in records],
+                          default=text_type) + "\n"
+
+        self._file.seek(0, 2)
+        self._offsets.append(self._file.tell())
+        self._file.write(data.encode("utf-8"))
+
+    def close(self):
+        """Discard every record, along with its file"""
+        if self._file is not None:
+            self._file.close()
+
+        self._file = None
+        self._offsets[:] = []
+        self._pages.clear()
+
+    def _page(self, page):
+        try:
+            records = self._pages.pop(page)
+
+        except KeyError:
+            self._file.seek(self._offsets[page])
+            records = [
+                Record(**data) for data in
+                json.loads(self._file.readline().decode("utf-8"))
+            ]
+
+            if len(self._pages) >= self._max_pages:
+                self._pages.popitem(last=False)
+
+        # Most recently read last
+        self._pages[page] = records
+
+        return records
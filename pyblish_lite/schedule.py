@@ -0,0 +1,111 @@
+"""Order in which plug-ins and instances are processed
+
+pyblish.logic.Iterator matches every plug-in against every instance,
+starting from the first plug-in, each time it is created. Publishing
+creates one on every validate and publish, skipping past plug-ins
+already processed, which grows slow with many plug-ins and instances.
+
+The :class:`Schedule` is created once per reset instead. Plug-ins are
+indexed by order, such that resuming is a seek rather than a skip, and
+whether a plug-in supports an instance is remembered per family, such
+that instances added by collectors are matched as they appear, without
+matching those already seen.
+
+"""
+
+import bisect
+
+import pyblish.api
+import pyblish.logic
+
+
+class Schedule(object):
+    """Plug-ins along with the instances each of them process
+
+    Arguments:
+        plugins (list): Plug-ins, sorted by order
+        context (pyblish.api.Context): Instances to consider
+        targets (list, optional): Targets of plug-ins to include,
+            defaults to "default" along with registered targets
+
+    """
+
+    def __init__(self, plugins, context, targets=None):
+        if not targets:
+            targets = ["default"] + pyblish.api.registered_targets()
+
+        self.plugins = pyblish.logic.plugins_by_targets(plugins, targets)
+        self.context = context
+
+        self._orders = [plugin.order for plugin in self.plugins]
+
+        # Compatibility of each plug-in, by index,
+        # with each combination of families
+        self._compatible = dict()
+
+    def __len__(self):
+        return len(self.plugins)
+
+    def seek(self, order):
+        """Return index of the first plug-in at or beyond `order`"""
+        return bisect.bisect_left(self._orders, order)
+
+    def instances(self, index):
+        """Return instances compatible with plug-in at `index`
+
+        Instances are matched as they are at the time of calling,
+        as plug-ins prior to this one may have added instances or
+        changed their families.
+
+        """
+
+        plugin = self.plugins[index]
+
+        if "*" in plugin.families:
+            return list(self.context)
+
+        compatible = list()
+
+        for instance in self.context:
+            family = instance.data.get("family")
+            families = (family,) + tuple(instance.data.get("families", []))
+            key = (index, families)
+
+            try:
+                is_compatible = self._compatible[key]
+
+            except KeyError:
+                is_compatible = bool(
+                    pyblish.logic.instances_by_plugin([instance], plugin)
+                )
+                self._compatible[key] = is_compatible
+
+            if is_compatible:
+                compatible.append(instance)
+
+        return compatible
+
+    def pairs(self, start=0, deferred=None):
+        """Yield each plug-in and instance from plug-in at `start`
+
+        Instances are None for plug-ins processing the Context. Each
+        plug-in is given the instances present once it is reached.
+
+        Arguments:
+            start (int, optional): Index of first plug-in
+            deferred (callable, optional): Plug-ins for which this
+                returns True are yielded once without an instance,
+                their instances gathered once they are processed
+
+        """
+
+        for index in range(start, len(self.plugins)):
+            plugin = self.plugins[index]
+
+            if not plugin.__instanceEnabled__ or (
+                    deferred is not None and deferred(plugin)):
+                yield plugin, None
+                continue
+
+            for instance in self.instances(index):
+                yield plugin, instance
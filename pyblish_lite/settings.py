@@ -9,4 +9,82 @@ InitialTab = "artist"
 WindowSize = (430, 600)
 
 # Simple filter for terminal.
-TerminalLoglevel = 10 # logging.DEBUG
\ No newline at end of file
+TerminalLoglevel = 10 # logging.DEBUG
+
+# Number of records of the terminal kept in memory. Older records are
+# written to a temporary file and read back when scrolled to. 0 keeps
+# every record in memory.
+TerminalCapacity = 10000
+
+# Milliseconds of processing per turn of the event loop. As many
+# plug-in/instance pairs as fit within this budget are processed before
+# the GUI is given the chance to repaint. 0 processes every pair without
+# yielding to the GUI.
+FrameBudget = 12
+
+# Number of threads used to process instances of plug-ins marked as
+# `threadsafe`.
+ThreadPoolSize = 8
+
+# Number of processes used to extract instances of plug-ins marked as
+# `multiprocess`. 0 uses one process per core.
+ProcessPoolSize = 0
+
+# Python interpreter of these processes, such as mayapy, as opposed to
+# that of the host. None uses the current one when it is Python, and
+# otherwise processes such plug-ins as any other where processes of the
+# pool are not forked, as on Windows and macOS.
+ProcessPoolExecutable = None
+
+# Process plug-ins in a worker thread, keeping the GUI responsive while
+# they run. Collection, and plug-ins marked with `main_thread`, such as
+# those using the API of the host application, are still processed in
+# the GUI thread.
+WorkerThread = False
+
+# Reuse results of validating instances whose data and members remain
+# unchanged since last being validated by an unchanged plug-in. Only
+# suitable when validators solely inspect the data of instances.
+IncrementalValidation = False
+
+# Persist passing results of validation on disk, and reuse them for
+# instances and plug-ins that remain unchanged, even across sessions.
+# Subject to the same caveat as IncrementalValidation.
+ValidationCache = False
+
+# Database of the validation cache, None stores it in the
+# cache directory of the user.
+ValidationCachePath = None
+
+# Maximum number of results in the validation cache, the least
+# recently used being discarded first.
+ValidationCacheSize = 100000
+
+# Persist check states of instances and plug-ins toggled by the artist
+# on disk, per project, and restore them once the window next opens.
+CheckStateCache = False
+
+# Database of check states, None stores it in the
+# cache directory of the user.
+CheckStateCachePath = None
+
+# Maximum number of check states on disk, those of the
+# least recently opened projects being discarded first.
+CheckStateCacheSize = 10000
+
+# Name of the project whose check states are stored and restored,
+# None uses the current working directory.
+CheckStateProject = None
+
+# Only execute modules of plug-ins whose file has changed since last
+# discovered, on reset, rather than every module on every reset.
+CacheDiscovery = True
+
+# Number of the slowest pairs of plug-in and instance
+# to list in the terminal once published, 0 lists none.
+SlowestPairs = 10
+
+# Write a timeline of each reset, validate, publish and action to this
+# file, in the Chrome Trace Event format, None writes nothing. Each
+# reset starts a new timeline.
+TracePath = None
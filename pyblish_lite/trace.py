@@ -0,0 +1,81 @@
+"""Timeline of publishing, in the Chrome Trace Event format
+
+Spans are recorded for each run, such as a reset or publish, each pair
+processed, the time the event loop spent on repainting and user input
+in between batches of pairs and the time the window spent updating
+itself with each result.
+
+The resulting file opens in Perfetto (ui.perfetto.dev), speedscope or
+chrome://tracing, without a connection to the internet.
+
+"""
+
+import json
+import os
+import threading
+import time
+
+
+class Tracer(object):
+    """Record of spans, written as a Chrome trace
+
+    Spans may be recorded from any thread.
+
+    """
+
+    def __init__(self):
+        self.events = list()
+        self._threads = set()
+        self._pid = os.getpid()
+
+    def span(self, name, start, end=None, category="run", args=None):
+        """Record span from `start` to `end`, in seconds since the epoch
+
+        Arguments:
+            name (str): Label of span, e.g. the name of a plug-in
+            start (float): Beginning of span, from time.time()
+            end (float, optional): End of span, defaults to now
+            category (str, optional): Kind of span, e.g. "pair"
+            args (dict, optional): Additional data shown with the span
+
+        """
+
+        end = time.time() if end is None else end
+        thread = threading.current_thread()
+
+        if thread.ident not in self._threads:
+            self._threads.add(thread.ident)
+            self.events.append({
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self._pid,
+                "tid": thread.ident,
+                "args": {"name": thread.name},
+            })
+
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start * 1000000,  # us
+            "dur": (end - start) * 1000000,
+            "pid": self._pid,
+            "tid": thread.ident,
+            "args": args or {},
+        })
+
+    def clear(self):
+        """Forget every span recorded thus far"""
+        self.events[:] = []
+        self._threads.clear()
+
+    def save(self, path):
+        """Write every span recorded thus far to `path`"""
+        dirname = os.path.dirname(os.path.abspath(path))
+
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": list(self.events),
+                       "displayTimeUnit": "ms"}, f, default=str)
@@ -26,6 +26,24 @@ def get_asset(*path):
     return os.path.join(root, *path)
 
 
+def cache_dir():
+    """Return directory in which to store data cached on disk
+
+    The directory is specific to the current user and
+    may not exist yet.
+
+    """
+
+    if os.name == "nt":
+        root = os.getenv("LOCALAPPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        root = os.path.expanduser("~/Library/Caches")
+    else:
+        root = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+
+    return os.path.join(root, "pyblish-lite")
+
+
 def defer(delay, func):
     """Append artificial delay to `func`
 
@@ -46,6 +64,50 @@ def defer(delay, func):
         return func()
 
 
+def next_tick(func):
+    """Call `func` on the next turn of the event loop
+
+    Unlike :func:`defer`, no artificial delay is added; Qt is merely
+    given the chance to process pending events, such as repaints and
+    user input, before `func` is called.
+
+    Arguments:
+        func (callable): Any callable
+
+    """
+
+    if is_synchronous():
+        return func()
+    return QtCore.QTimer.singleShot(0, func)
+
+
+def is_synchronous():
+    """Return whether deferred calls are run immediately
+
+    Setting the environment variable PYBLISH_DELAY to 0 makes
+    every deferred call synchronous, such as during tests.
+
+    """
+
+    return float(os.getenv("PYBLISH_DELAY", 1)) <= 0
+
+
+def format_duration(duration):
+    """Return human-readable `duration`, given in milliseconds
+
+    Example:
+        >>> format_duration(12.3)
+        '12 ms'
+        >>> format_duration(2345)
+        '2.3 s'
+
+    """
+
+    if duration < 1000:
+        return "%d ms" % duration
+    return "%.1f s" % (duration / 1000.0)
+
+
 def u_print(msg, **kwargs):
     """`print` with encoded unicode.
 
@@ -41,14 +41,20 @@ Todo:
 """
 from functools import partial
 import os
+import threading
+import time
 
-from . import delegate, model, settings, util, view
+from . import cache, delegate, model, settings, util, view
 from .awesome import tags as awesome
 
 from .vendor.Qt import QtCore, QtGui, QtWidgets, Qt
 
 
 class Window(QtWidgets.QDialog):
+
+    # Calls from other threads, made in the GUI thread
+    _marshalled = QtCore.Signal(object)
+
     def __init__(self, controller, parent=None):
         super(Window, self).__init__(parent)
         icon = QtGui.QIcon(util.get_asset("img", "logo-extrasmall.png"))
@@ -63,6 +69,9 @@ class Window(QtWidgets.QDialog):
         self.controller = controller
         self._delegates = []
 
+        # Check states persisted across sessions, see CheckStateCache
+        self._checkstate_cache = None
+
         """General layout
          __________________       _____________________
         |                  |     |       |       |     |
@@ -471,6 +480,11 @@ class Window(QtWidgets.QDialog):
 
             "state": {
                 "is_closing": False,
+                "is_reset": False,
+
+                # Persisted check states, by hash of key, once loaded
+                "checkstates": None,
+                "is_flushing_checkstates": False,
             }
         }
 
@@ -506,13 +520,14 @@ class Window(QtWidgets.QDialog):
         controller.was_discovered.connect(self.on_was_discovered,
                                           QtCore.Qt.DirectConnection)
 
-        # This is called synchronously on each process
-        controller.was_processed.connect(self.on_was_processed,
-                                         QtCore.Qt.DirectConnection)
+        # These are called synchronously on each process, unless
+        # the controller is processing in a worker thread, in which
+        # case they are queued and run in the main thread.
+        controller.was_processed.connect(self.on_was_processed)
+        controller.about_to_process.connect(self.on_about_to_process)
 
-        # NOTE: Listeners to this signal are run in the main thread
-        controller.about_to_process.connect(self.on_about_to_process,
-                                            QtCore.Qt.DirectConnection)
+        self._marshalled.connect(self._on_marshalled,
+                                 QtCore.Qt.QueuedConnection)
 
         artist_view.toggled.connect(self.on_item_toggled)
         left_view.toggled.connect(self.on_item_toggled)
@@ -612,7 +627,7 @@ class Window(QtWidgets.QDialog):
                 "heading": index.data(model.Label),
                 "subheading": ", ".join(index.data(model.Families)),
                 "text": index.data(model.Docstring) or "",
-                "timestamp": str(index.data(model.Duration) or 0) + " ms",
+                "timestamp": self._format_cost(index),
             })
 
         elif index.data(model.Type) == "instance":
@@ -621,7 +636,7 @@ class Window(QtWidgets.QDialog):
                 "heading": index.data(model.Label),
                 "subheading": ", ".join(index.data(model.Families)),
                 "text": "",
-                "timestamp": str(index.data(model.Duration) or 0) + " ms",
+                "timestamp": self._format_cost(index),
             })
 
     def on_item_toggled(self, index, state=None):
@@ -636,6 +651,7 @@ class Window(QtWidgets.QDialog):
             state = not index.data(model.IsChecked)
 
         index.model().setData(index, state, model.IsChecked)
+        self._persist_checkstate(index, state)
 
         # Withdraw option to publish if no instances are toggled
         play = self.findChild(QtWidgets.QWidget, "Play")
@@ -716,13 +732,11 @@ class Window(QtWidgets.QDialog):
 
         if instance is not None:
             instance_model = self.data["models"]["instances"]
-            index = instance_model.items.index(instance)
-            index = instance_model.createIndex(index, 0)
+            index = instance_model.createIndex(instance_model.row(instance), 0)
             instance_model.setData(index, True, model.IsProcessing)
 
         plugin_model = self.data["models"]["plugins"]
-        index = plugin_model.items.index(plugin)
-        index = plugin_model.createIndex(index, 0)
+        index = plugin_model.createIndex(plugin_model.row(plugin), 0)
         plugin_model.setData(index, True, model.IsProcessing)
         self.info("%s %s" % (self.tr("Processing"), index.data(model.Label)))
 
@@ -759,8 +773,10 @@ class Window(QtWidgets.QDialog):
     def on_was_discovered(self):
         models = self.data["models"]
 
-        for Plugin in self.controller.plugins:
-            models["plugins"].append(Plugin)
+        models["plugins"].extend(self.controller.plugins)
+
+        # Alongside collection
+        self._load_checkstates()
 
     def on_was_reset(self):
         models = self.data["models"]
@@ -768,8 +784,7 @@ class Window(QtWidgets.QDialog):
         self.info(self.tr("Finishing up reset.."))
 
         models["instances"].reset()
-        for instance in self.controller.context:
-            models["instances"].append(instance)
+        models["instances"].extend(self.controller.context)
 
         buttons = self.data["buttons"]
         buttons["play"].show()
@@ -780,6 +795,12 @@ class Window(QtWidgets.QDialog):
         models["instances"].restore_checkstate()
         models["plugins"].restore_checkstate()
 
+        state = self.data["state"]
+        state["is_reset"] = True
+
+        if state["checkstates"] is not None:
+            self._restore_checkstates()
+
         # Append placeholder comment from Context
         # This allows users to inject a comment from elsewhere,
         # or to perhaps provide a placeholder comment/template
@@ -800,11 +821,13 @@ class Window(QtWidgets.QDialog):
         plugin_model = self.data["models"]["plugins"]
         instance_model = self.data["models"]["instances"]
 
-        for index in plugin_model:
-            index.model().setData(index, False, model.IsIdle)
+        with plugin_model.transaction():
+            for index in plugin_model:
+                plugin_model.setData(index, False, model.IsIdle)
 
-        for index in instance_model:
-            index.model().setData(index, False, model.IsIdle)
+        with instance_model.transaction():
+            for index in instance_model:
+                instance_model.setData(index, False, model.IsIdle)
 
         buttons = self.data["buttons"]
         buttons["reset"].show()
@@ -817,11 +840,13 @@ class Window(QtWidgets.QDialog):
         plugin_model = self.data["models"]["plugins"]
         instance_model = self.data["models"]["instances"]
 
-        for index in plugin_model:
-            index.model().setData(index, False, model.IsIdle)
+        with plugin_model.transaction():
+            for index in plugin_model:
+                plugin_model.setData(index, False, model.IsIdle)
 
-        for index in instance_model:
-            index.model().setData(index, False, model.IsIdle)
+        with instance_model.transaction():
+            for index in instance_model:
+                instance_model.setData(index, False, model.IsIdle)
 
         buttons = self.data["buttons"]
         buttons["reset"].show()
@@ -830,30 +855,66 @@ class Window(QtWidgets.QDialog):
         comment_box = self.findChild(QtWidgets.QWidget, "CommentBox")
         comment_box.hide()
 
+        # Summarise where time went, slowest first
+        slowest = self.controller.slowest(settings.SlowestPairs)
+        terminal = self.data["models"]["terminal"]
+
+        if slowest:
+            terminal.append({
+                "label": self.tr("Slowest plug-ins and instances:"),
+                "type": "info"
+            })
+
+        for result in slowest:
+            plugin = result["plugin"]
+            instance = result["instance"]
+
+            label = getattr(plugin, "label", None) or plugin.__name__
+            if instance is not None:
+                label += " (%s)" % instance.data.get("label",
+                                                     instance.data["name"])
+
+            terminal.append({
+                "label": "%s  %s" % (
+                    util.format_duration(result["duration"]).rjust(8),
+                    label),
+                "type": "info"
+            })
+
         self.on_finished()
 
     def on_was_processed(self, result):
+        started = time.time()
         models = self.data["models"]
+        plugins_filter = models["filter"]
+
+        # Adding families already included does nothing,
+        # and filtering happens once per turn of the event loop.
+        added = list()
 
         for instance in self.controller.context:
             if instance.id not in models["instances"].ids:
-                models["instances"].append(instance)
+                added.append(instance)
 
             family = instance.data["family"]
             if family:
-                plugins_filter = self.data["models"]["filter"]
                 plugins_filter.add_inclusion(role="families", value=family)
 
             families = instance.data.get("families")
             if families:
                 for f in families:
-                    plugins_filter = self.data["models"]["filter"]
                     plugins_filter.add_inclusion(role="families", value=f)
 
+        models["instances"].extend(added)
+
         models["plugins"].update_with_result(result)
         models["instances"].update_with_result(result)
         models["terminal"].update_with_result(result)
 
+        tracer = self.controller.tracer
+        if tracer is not None:
+            tracer.span("on_was_processed", started, category="gui")
+
     def on_was_acted(self, result):
         buttons = self.data["buttons"]
         buttons["reset"].show()
@@ -862,11 +923,11 @@ class Window(QtWidgets.QDialog):
         # Update action with result
         model_ = self.data["models"]["plugins"]
 
-        index = model_.items.index(result["plugin"])
-        index = model_.createIndex(index, 0)
+        index = model_.createIndex(model_.row(result["plugin"]), 0)
 
-        model_.setData(index, not result["success"], model.ActionFailed)
-        model_.setData(index, False, model.IsProcessing)
+        with model_.transaction():
+            model_.setData(index, not result["success"], model.ActionFailed)
+            model_.setData(index, False, model.IsProcessing)
 
         models = self.data["models"]
         models["terminal"].update_with_result(result)
@@ -897,9 +958,10 @@ class Window(QtWidgets.QDialog):
 
         models["instances"].store_checkstate()
         models["plugins"].store_checkstate()
+        self.data["state"]["is_reset"] = False
 
         # Reset current ids to secure no previous instances get mixed in.
-        models["instances"].ids = []
+        models["instances"].ids = set()
 
         for m in models.values():
             m.reset()
@@ -910,7 +972,7 @@ class Window(QtWidgets.QDialog):
         comment_box = self.findChild(QtWidgets.QWidget, "CommentBox")
         comment_box.hide()
 
-        util.defer(500, self.controller.reset)
+        self._defer(500, self.controller.reset)
 
     def validate(self):
         self.info(self.tr("Preparing validate.."))
@@ -918,7 +980,7 @@ class Window(QtWidgets.QDialog):
             button.hide()
 
         self.data["buttons"]["stop"].show()
-        util.defer(5, self.controller.validate)
+        self._defer(5, self.controller.validate)
 
     def publish(self):
         self.info(self.tr("Preparing publish.."))
@@ -927,7 +989,7 @@ class Window(QtWidgets.QDialog):
             button.hide()
 
         self.data["buttons"]["stop"].show()
-        util.defer(5, self.controller.publish)
+        self._defer(5, self.controller.publish)
 
     def act(self, plugin, action):
         self.info("%s %s.." % (self.tr("Preparing"), action))
@@ -942,16 +1004,16 @@ class Window(QtWidgets.QDialog):
         # happen until Qt is given time to idle..
         model_ = self.data["models"]["plugins"]
 
-        index = model_.items.index(plugin)
-        index = model_.createIndex(index, 0)
+        index = model_.createIndex(model_.row(plugin), 0)
 
-        for key, value in {model.ActionIdle: False,
-                           model.ActionFailed: False,
-                           model.IsProcessing: True}.items():
-            model_.setData(index, value, key)
+        with model_.transaction():
+            for key, value in {model.ActionIdle: False,
+                               model.ActionFailed: False,
+                               model.IsProcessing: True}.items():
+                model_.setData(index, value, key)
 
         # Give Qt time to draw
-        util.defer(100, lambda: self.controller.act(plugin, action))
+        self._defer(100, lambda: self.controller.act(plugin, action))
 
         self.info(self.tr("Action prepared."))
 
@@ -983,6 +1045,10 @@ class Window(QtWidgets.QDialog):
             self.info(self.tr("Cleaning up controller.."))
             self.controller.cleanup()
 
+            if self._checkstate_cache is not None:
+                self._checkstate_cache.close()
+                self._checkstate_cache = None
+
             self.info(self.tr("All clean!"))
             self.info(self.tr("Good bye"))
             return super(Window, self).closeEvent(event)
@@ -1068,6 +1134,122 @@ class Window(QtWidgets.QDialog):
         # TODO(marcus): Implement this.
         self.info(message)
 
+    def _defer(self, delay, func):
+        """Call `func` after `delay`, recording the wait when tracing"""
+        tracer = self.controller.tracing()
+
+        if tracer is not None:
+            started = time.time()
+
+            def call(func=func):
+                tracer.span("defer", started, category="gui",
+                            args={"delay": delay})
+                func()
+
+            func = call
+
+        util.defer(delay, func)
+
+    def _format_cost(self, index):
+        """Return total duration, CPU time and memory of `index`"""
+        cost = util.format_duration(index.data(model.Duration) or 0)
+
+        cpu_duration = index.data(model.CpuDuration)
+        if cpu_duration:
+            cost += ", %s CPU" % util.format_duration(cpu_duration)
+
+        memory = index.data(model.Memory)
+        if memory:
+            cost += ", +%.1f MB" % (memory / 1024.0 / 1024.0)
+
+        return cost
+
+    def _on_marshalled(self, func):
+        func()
+
+    def _load_checkstates(self):
+        """Load check states persisted for this project, in a thread"""
+        state = self.data["state"]
+        state["checkstates"] = None
+
+        if not settings.CheckStateCache:
+            return
+
+        if self._checkstate_cache is None:
+            self._checkstate_cache = cache.CheckStateCache(
+                settings.CheckStateCachePath,
+                settings.CheckStateCacheSize)
+
+        store = self._checkstate_cache
+        project = settings.CheckStateProject or os.getcwd()
+
+        def on_loaded(checkstates):
+            state["checkstates"] = checkstates
+
+            # Otherwise restored once reset
+            if state["is_reset"]:
+                self._restore_checkstates()
+
+        if util.is_synchronous():
+            return on_loaded(store.load(project))
+
+        def load():
+            checkstates = store.load(project)
+            self._marshalled.emit(lambda: on_loaded(checkstates))
+
+        worker = threading.Thread(target=load)
+        worker.daemon = True
+        worker.start()
+
+    def _restore_checkstates(self):
+        """Apply persisted check states of items not yet seen this session"""
+        checkstates = self.data["state"]["checkstates"]
+
+        for name in ("instances", "plugins"):
+            model_ = self.data["models"][name]
+
+            for index in model_:
+                key = model.checkstate_key(index)
+
+                if key in model_.checkstate:
+                    continue
+
+                if not index.data(model.IsOptional):
+                    continue
+
+                state = checkstates.get(cache.hash_key(
+                    "%s.%s" % (index.data(model.Type), key)))
+
+                if state is not None:
+                    model_.checkstate[key] = state
+
+            model_.restore_checkstate()
+
+    def _persist_checkstate(self, index, state):
+        """Store check state of `index` on disk, along with others"""
+        store = self._checkstate_cache
+
+        if store is None:
+            return
+
+        store.set(settings.CheckStateProject or os.getcwd(),
+                  "%s.%s" % (index.data(model.Type),
+                             model.checkstate_key(index)),
+                  state)
+
+        # Write every toggle within a second at once
+        if self.data["state"]["is_flushing_checkstates"]:
+            return
+
+        def flush():
+            self.data["state"]["is_flushing_checkstates"] = False
+
+            if self._checkstate_cache is not None:
+                self._checkstate_cache.flush()
+
+        self.data["state"]["is_flushing_checkstates"] = True
+        util.defer(1000, flush)
+
     def _find_scale(self):
         if Qt.__qt_version__.startswith("5") and os.name == "nt":
             window = self.window()
@@ -0,0 +1,250 @@
+"""Benchmark publishing of synthetic plug-ins and instances
+
+Each scenario publishes plug-ins generated by :func:`mock.generate`,
+once with the controller alone and once with a window, under the
+offscreen platform of Qt and without artificial delays. Scenarios run
+in a process of their own, unaffected by those prior.
+
+    pairs_per_second    Pairs processed per second, by the controller
+    model_update        Milliseconds the window spends per result,
+                        updating its models
+    peak_memory         Peak bytes allocated by Python while publishing
+    terminal_memory     Bytes the terminal takes per 100,000 records,
+                        when keeping every record in memory
+
+Results are compared with the baseline of each scenario in
+tests/baseline, so as to make regressions visible in review. Baselines
+are only comparable on the machine on which they were made, update them
+alongside changes affecting performance.
+
+Usage:
+    $ python tests/benchmark.py
+    $ python tests/benchmark.py --scenario plugins --update
+
+"""
+
+import os
+import sys
+
+# Prior to importing Qt
+os.environ["PYBLISH_DELAY"] = "0"
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import json
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+# Benchmark this repository, rather than any installed version
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+import pyblish.api
+
+from pyblish_lite import control, mock, model, settings, window
+from pyblish_lite.vendor.Qt import QtWidgets
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "baseline")
+
+# Fraction by which a measurement may be worse than its baseline
+TOLERANCE = 0.25
+
+# Times to publish with the controller alone
+REPEAT = 3
+
+scenarios = {
+    "small": {"plugins": 10, "instances": 10, "fanout": 1, "records": 1},
+    "plugins": {"plugins": 200, "instances": 20, "fanout": 2, "records": 1},
+    "instances": {"plugins": 20, "instances": 500, "fanout": 2, "records": 1},
+    "records": {"plugins": 10, "instances": 20, "fanout": 5, "records": 10},
+}
+
+
+def publish(ctrl):
+    """Reset and publish `ctrl`, returning its results"""
+    results = list()
+    ctrl.was_processed.connect(results.append)
+
+    ctrl.reset()
+    ctrl.publish()
+
+    return results
+
+
+def measure(scenario):
+    """Return measurements of `scenario`, see above"""
+    plugins = mock.generate(**scenarios[scenario])
+
+    for plugin in plugins:
+        pyblish.api.register_plugin(plugin)
+
+    tempdir = tempfile.mkdtemp()
+
+    try:
+        # Controller alone, best of a few to reduce noise
+        durations = list()
+
+        for attempt in range(REPEAT):
+            before = time.time()
+            results = publish(control.Controller())
+            durations.append(time.time() - before)
+
+        duration = min(durations)
+
+        # Window, whose updates are measured with a trace
+        settings.TracePath = os.path.join(tempdir, "trace.json")
+
+        ctrl = control.Controller()
+        win = window.Window(ctrl)
+        win.reset()
+        win.publish()
+
+        spans = [event["dur"] for event in ctrl.tracer.events
+                 if event.get("name") == "on_was_processed"]
+        win.close()
+
+        settings.TracePath = None
+
+        # Memory, separately as tracing allocations is slow
+        tracemalloc.start()
+        publish(control.Controller())
+        peak = tracemalloc.get_traced_memory()[1]
+
+        # Terminal, with the records of every result
+        capacity, settings.TerminalCapacity = settings.TerminalCapacity, 0
+        terminal = model.Terminal()
+
+        before = tracemalloc.get_traced_memory()[0]
+        for result in results:
+            terminal.update_with_result(result)
+
+        records = terminal.rowCount()
+        terminal_memory = tracemalloc.get_traced_memory()[0] - before
+
+        settings.TerminalCapacity = capacity
+        tracemalloc.stop()
+
+    finally:
+        settings.TracePath = None
+        shutil.rmtree(tempdir)
+
+        for plugin in plugins:
+            pyblish.api.deregister_plugin(plugin)
+
+    return {
+        "scenario": dict(scenarios[scenario]),
+        "pairs": len(results),
+        "pairs_per_second": round(len(results) / duration, 1),
+        "model_update": round(sum(spans) / len(spans) / 1000.0, 4),
+        "peak_memory": peak,
+        "terminal_memory": terminal_memory * 100000 // max(records, 1),
+    }
+
+
+def compare(result, baseline):
+    """Return regressions of `result` compared with `baseline`"""
+    regressions = list()
+
+    # Higher is better, as opposed to the remainder
+    if result["pairs_per_second"] < (baseline["pairs_per_second"] *
+                                     (1 - TOLERANCE)):
+        regressions.append("pairs_per_second")
+
+    for key in ("model_update", "peak_memory", "terminal_memory"):
+        if key not in baseline:
+            continue
+
+        if result[key] > baseline[key] * (1 + TOLERANCE):
+            regressions.append(key)
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", action="append",
+                        choices=sorted(scenarios),
+                        help="Run only this scenario, defaults to all")
+    parser.add_argument("--update", action="store_true",
+                        help="Overwrite the baseline with the results")
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+
+    if args.output:
+        app = QtWidgets.QApplication.instance()
+        app = app or QtWidgets.QApplication(sys.argv)  # noqa
+
+        # Measured first, such that a crash leaves no output
+        result = measure(args.scenario[0])
+
+        with open(args.output, "w") as f:
+            json.dump(result, f)
+
+        return 0
+
+    regressed = False
+    tempdir = tempfile.mkdtemp()
+
+    try:
+        results = dict()
+
+        for scenario in args.scenario or sorted(scenarios):
+            output = os.path.join(tempdir, scenario + ".json")
+
+            # Only the output matters, as opposed to the exit code,
+            # as some bindings crash on exit with many objects alive.
+            with open(os.devnull, "w") as devnull:
+                subprocess.call([sys.executable,
+                                 os.path.abspath(__file__),
+                                 "--scenario", scenario,
+                                 "--output", output],
+                                stdout=devnull)
+
+            if not os.path.exists(output) or not os.path.getsize(output):
+                raise RuntimeError("Scenario '%s' failed" % scenario)
+
+            with open(output) as f:
+                results[scenario] = json.load(f)
+
+    finally:
+        shutil.rmtree(tempdir)
+
+    for scenario, result in sorted(results.items()):
+        path = os.path.join(BASELINE, scenario + ".json")
+
+        print("%-10s %6d pairs  %8.1f pairs/s  %7.3f ms/update  %6.1f MB  "
+              "%6.1f MB/100k records" % (
+                  scenario,
+                  result["pairs"],
+                  result["pairs_per_second"],
+                  result["model_update"],
+                  result["peak_memory"] / 1024.0 / 1024.0,
+                  result["terminal_memory"] / 1024.0 / 1024.0))
+
+        if args.update:
+            if not os.path.isdir(BASELINE):
+                os.makedirs(BASELINE)
+
+            with open(path, "w") as f:
+                json.dump(result, f, indent=4, sort_keys=True)
+                f.write("\n")
+
+        elif os.path.exists(path):
+            with open(path) as f:
+                baseline = json.load(f)
+
+            for key in compare(result, baseline):
+                regressed = True
+                print("  regressed: %s %s, baseline %s" % (
+                    key, result[key], baseline[key]))
+
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
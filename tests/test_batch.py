@@ -0,0 +1,126 @@
+import json
+import os
+import shutil
+import tempfile
+import textwrap
+
+import pyblish.api
+from pyblish_lite import batch
+
+# Vendor libraries
+from nose.tools import (
+    with_setup,
+    assert_equals
+)
+
+
+def clean():
+    pyblish.api.deregister_all_plugins()
+
+
+def setup_function(function):
+    # Runners other than nose, such as pytest, ignore @with_setup
+    clean()
+
+
+@with_setup(clean)
+def test_publish():
+    """Each work item is published in a session of its own"""
+
+    tempdir = tempfile.mkdtemp()
+    plugins = os.path.join(tempdir, "plugins")
+    os.makedirs(plugins)
+
+    with open(os.path.join(plugins, "validate_scene.py"), "w") as f:
+        f.write(textwrap.dedent("""\
+            import os
+            import pyblish.api
+
+            class CollectScene(pyblish.api.ContextPlugin):
+                order = pyblish.api.CollectorOrder
+
+                def process(self, context):
+                    scene = context.data["currentFile"]
+                    name = os.path.basename(scene)
+                    context.create_instance(name, asset=context.data["asset"])
+
+            class ValidateScene(pyblish.api.InstancePlugin):
+                order = pyblish.api.ValidatorOrder
+
+                def process(self, instance):
+                    assert instance.name != "bad.ma", "Bad scene"
+            """))
+
+    items = [
+        {"scene": os.path.join(tempdir, name),
+         "paths": [plugins],
+         "data": {"asset": name},
+         "output": os.path.join(tempdir, name + ".jsonl")}
+        for name in ("a.ma", "bad.ma", "c.ma")
+    ]
+
+    try:
+        summary = batch.publish(items, processes=2)
+
+        with open(items[0]["output"]) as f:
+            lines = [json.loads(line) for line in f]
+
+    finally:
+        shutil.rmtree(tempdir)
+
+    assert not summary["success"], summary
+    assert_equals(summary["items"], 3)
+    assert_equals(summary["failed"], 1)
+    assert_equals([result["scene"] for result in summary["results"]],
+                  [item["scene"] for item in items])
+    assert_equals([result["success"] for result in summary["results"]],
+                  [True, False, True])
+
+    instances = set(line["instance"] for line in lines
+                    if line["type"] == "result")
+    assert_equals(instances, set([None, "a.ma"]))
+
+
+@with_setup(clean)
+def test_publish_common():
+    """Paths common to every item are registered in every process"""
+
+    tempdir = tempfile.mkdtemp()
+    plugins = os.path.join(tempdir, "plugins")
+    os.makedirs(plugins)
+
+    with open(os.path.join(plugins, "collect_scene.py"), "w") as f:
+        f.write(textwrap.dedent("""\
+            import os
+            import pyblish.api
+
+            class CollectScene(pyblish.api.ContextPlugin):
+                order = pyblish.api.CollectorOrder
+
+                def process(self, context):
+                    scene = context.data["currentFile"]
+                    context.create_instance(os.path.basename(scene))
+            """))
+
+    items = [
+        {"scene": os.path.join(tempdir, name),
+         "output": os.path.join(tempdir, name + ".jsonl")}
+        for name in ("a.ma", "b.ma")
+    ]
+
+    try:
+        summary = batch.publish(items, processes=2, paths=[plugins])
+
+        processed = list()
+        for item in items:
+            with open(item["output"]) as f:
+                processed.append([json.loads(line).get("plugin")
+                                  for line in f])
+
+    finally:
+        shutil.rmtree(tempdir)
+
+    assert summary["success"], summary
+    assert plugins not in pyblish.api.registered_paths()
+    for names in processed:
+        assert "CollectScene" in names, names
@@ -0,0 +1,126 @@
+import os
+import shutil
+import tempfile
+
+from pyblish_lite import cache
+
+# Vendor libraries
+from nose.tools import assert_equals
+
+
+def test_get_set():
+    """Stored values are retrieved by key"""
+
+    tempdir = tempfile.mkdtemp()
+
+    try:
+        store = cache.ValidationCache(os.path.join(tempdir, "cache.db"))
+        store.set(("plugin", "a"), "MyValidator", {"duration": 1.0})
+
+        assert_equals(store.get(("plugin", "a")), {"duration": 1.0})
+        assert_equals(store.get(("plugin", "b")), None)
+
+        # Persisted across sessions
+        store.close()
+        store = cache.ValidationCache(os.path.join(tempdir, "cache.db"))
+        assert_equals(store.get(("plugin", "a")), {"duration": 1.0})
+        store.close()
+
+    finally:
+        shutil.rmtree(tempdir)
+
+
+def test_eviction():
+    """The least recently used values are discarded first"""
+
+    tempdir = tempfile.mkdtemp()
+
+    try:
+        store = cache.ValidationCache(os.path.join(tempdir, "cache.db"),
+                                      size=2)
+
+        for name in ("a", "b", "c"):
+            store.set(("plugin", name), "MyValidator", {})
+
+        store.get(("plugin", "a"))
+        store.flush()
+
+        assert_equals(len(store), 2)
+        assert_equals(store.get(("plugin", "a")), {})
+        assert_equals(store.get(("plugin", "b")), None)
+        store.close()
+
+    finally:
+        shutil.rmtree(tempdir)
+
+
+def test_invalidate():
+    """Values are forgotten per plug-in, or altogether"""
+
+    tempdir = tempfile.mkdtemp()
+
+    try:
+        store = cache.ValidationCache(os.path.join(tempdir, "cache.db"))
+        store.set(("a", "instance"), "ValidatorA", {})
+        store.set(("b", "instance"), "ValidatorB", {})
+
+        store.invalidate("ValidatorA")
+        assert_equals(store.get(("a", "instance")), None)
+        assert_equals(store.get(("b", "instance")), {})
+
+        store.invalidate()
+        assert_equals(len(store), 0)
+        store.close()
+
+    finally:
+        shutil.rmtree(tempdir)
+
+
+def test_checkstates():
+    """Check states are stored per project, once flushed"""
+
+    tempdir = tempfile.mkdtemp()
+
+    try:
+        store = cache.CheckStateCache(os.path.join(tempdir, "cache.db"))
+        store.set("ProjectA", "instance.['a'].A", False)
+        store.set("ProjectB", "instance.['a'].A", True)
+        assert_equals(len(store), 0)
+
+        store.flush()
+        assert_equals(len(store), 2)
+
+        # Persisted across sessions
+        store.close()
+        store = cache.CheckStateCache(os.path.join(tempdir, "cache.db"))
+        key = cache.hash_key("instance.['a'].A")
+        assert_equals(store.load("ProjectA"), {key: False})
+        assert_equals(store.load("ProjectB"), {key: True})
+        assert_equals(store.load("ProjectC"), {})
+        store.close()
+
+    finally:
+        shutil.rmtree(tempdir)
+
+
+def test_checkstate_eviction():
+    """Check states of the least recently loaded projects are discarded"""
+
+    tempdir = tempfile.mkdtemp()
+
+    try:
+        store = cache.CheckStateCache(os.path.join(tempdir, "cache.db"),
+                                      size=2)
+        store.set("ProjectA", "a", False)
+        store.flush()
+
+        store.set("ProjectB", "a", False)
+        store.set("ProjectB", "b", False)
+        store.flush()
+
+        assert_equals(store.load("ProjectA"), {})
+        assert_equals(len(store.load("ProjectB")), 2)
+        store.close()
+
+    finally:
+        shutil.rmtree(tempdir)
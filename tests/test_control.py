@@ -1,6 +1,17 @@
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+
 import pyblish.api
 import pyblish.lib
-from pyblish_lite import control
+from pyblish_lite import control, model, settings
+from pyblish_lite.vendor.Qt import QtCore
 
 # Vendor libraries
 from nose.tools import (
@@ -13,6 +24,11 @@ def clean():
     pyblish.api.deregister_all_plugins()
 
 
+def setup_function(function):
+    # Runners other than nose, such as pytest, ignore @with_setup
+    clean()
+
+
 @with_setup(clean)
 def test_something():
     """Anything runs"""
@@ -360,3 +376,943 @@ def test_controller_signals():
         "was_published": 1,
         "was_finished": 3,
     })
+
+
+@with_setup(clean)
+def test_frame_budget():
+    """Processing yields to the event loop once the frame budget is spent"""
+
+    count = {"#": 0}
+
+    class BudgetCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for name in ("A", "B", "C"):
+                context.create_instance(name)
+
+    class SlowValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def process(self, instance):
+            time.sleep(0.01)
+            count["#"] += 1
+
+    for plugin in [BudgetCollector, SlowValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    finished = {"#": 0}
+
+    ctrl = control.Controller()
+    ctrl.was_finished.connect(lambda: finished.update({"#": 1}))
+    ctrl.reset()
+
+    finished["#"] = 0
+    os.environ["PYBLISH_DELAY"] = "1"
+    settings.FrameBudget = 1
+
+    try:
+        ctrl.validate()
+
+        app = QtCore.QCoreApplication.instance()
+        app.processEvents()
+        assert count["#"] < 3, count
+
+        while not finished["#"]:
+            app.processEvents()
+
+    finally:
+        os.environ["PYBLISH_DELAY"] = "0"
+        settings.FrameBudget = 12
+
+    assert count["#"] == 3, count
+
+
+@with_setup(clean)
+def test_threadsafe():
+    """Instances of threadsafe plug-ins are processed concurrently"""
+
+    results = list()
+    overlapped = dict()
+    arrived = list()
+    everyone = threading.Event()
+    lock = threading.Lock()
+
+    class ThreadsafeCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for name in ("A", "B", "C", "D"):
+                context.create_instance(name)
+
+    class ThreadsafeValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        threadsafe = True
+
+        def process(self, instance):
+            # Only arrived at by all at once when processed concurrently
+            with lock:
+                arrived.append(instance.name)
+                if len(arrived) == 4:
+                    everyone.set()
+
+            overlapped[instance.name] = everyone.wait(5)
+            self.log.info(instance.name)
+
+    for plugin in [ThreadsafeCollector, ThreadsafeValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    def on_processed(result):
+        if issubclass(result["plugin"], ThreadsafeValidator):
+            results.append(result)
+
+    ctrl = control.Controller()
+    ctrl.was_processed.connect(on_processed)
+    ctrl.reset()
+    ctrl.validate()
+
+    assert all(overlapped.values()), overlapped
+    assert_equals([r["instance"].name for r in results],
+                  ["A", "B", "C", "D"])
+
+    # In order, regardless of which thread finished first
+    assert_equals([r["instance"].name for r in ctrl.context.data["results"]
+                   if issubclass(r["plugin"], ThreadsafeValidator)],
+                  ["A", "B", "C", "D"])
+
+    for result in results:
+        messages = [record.msg for record in result["records"]]
+        assert_equals(messages, [result["instance"].name])
+
+
+@with_setup(clean)
+def test_threadsafe_families():
+    """Plug-ins following threadsafe ones see the families they added"""
+
+    processed = list()
+
+    class FamiliesCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for name in ("A", "B"):
+                context.create_instance(name)
+
+    class ThreadsafeFamilies(pyblish.api.InstancePlugin):
+        order = pyblish.api.CollectorOrder + 0.1
+        threadsafe = True
+
+        def process(self, instance):
+            instance.data["families"] = ["extra"]
+
+    class ExtraCollector(pyblish.api.InstancePlugin):
+        order = pyblish.api.CollectorOrder + 0.2
+        families = ["extra"]
+
+        def process(self, instance):
+            processed.append(instance.name)
+
+    for plugin in [FamiliesCollector, ThreadsafeFamilies, ExtraCollector]:
+        pyblish.api.register_plugin(plugin)
+
+    ctrl = control.Controller()
+    ctrl.reset()
+
+    assert_equals(processed, ["A", "B"])
+
+
+@with_setup(clean)
+def test_threadsafe_failed_validation():
+    """Failing threadsafe validators still stop publishing"""
+
+    count = {"#": 0}
+
+    class FailingCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for name in ("A", "B"):
+                context.create_instance(name)
+
+    class FailingValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        threadsafe = True
+
+        def process(self, instance):
+            assert False, "Failed"
+
+    class SkippedExtractor(pyblish.api.InstancePlugin):
+        order = pyblish.api.ExtractorOrder
+
+        def process(self, instance):
+            count["#"] += 1
+
+    for plugin in [FailingCollector, FailingValidator, SkippedExtractor]:
+        pyblish.api.register_plugin(plugin)
+
+    ctrl = control.Controller()
+    ctrl.reset()
+    ctrl.publish()
+
+    assert count["#"] == 0, count
+
+
+@with_setup(clean)
+def test_threadsafe_main_thread():
+    """Threadsafe plug-ins bound to the main thread are processed in it"""
+
+    threads = list()
+
+    class MainThreadCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for name in ("A", "B"):
+                context.create_instance(name)
+
+    class MainThreadValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        threadsafe = True
+        main_thread = True
+
+        def process(self, instance):
+            threads.append(threading.current_thread().ident)
+
+    for plugin in [MainThreadCollector, MainThreadValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    ctrl = control.Controller()
+
+    # Otherwise validating waits forever
+    assert not ctrl._is_threadsafe(MainThreadValidator)
+
+    ctrl.reset()
+    ctrl.validate()
+
+    assert_equals(threads, [threading.current_thread().ident] * 2)
+
+
+@with_setup(clean)
+def test_multiprocess():
+    """Extractors marked multiprocess run in a separate process"""
+
+    tempdir = tempfile.mkdtemp()
+    results = list()
+
+    with open(os.path.join(tempdir, "extract_double.py"), "w") as f:
+        f.write(textwrap.dedent("""\
+            import os
+            import pyblish.api
+
+            class CollectValue(pyblish.api.ContextPlugin):
+                order = pyblish.api.CollectorOrder
+
+                def process(self, context):
+                    for name in ("A", "B"):
+                        instance = context.create_instance(name)
+                        instance.data["value"] = 2
+
+            class ExtractDouble(pyblish.api.InstancePlugin):
+                order = pyblish.api.ExtractorOrder
+                multiprocess = True
+
+                def process(self, instance):
+                    self.log.info("Doubling %s", instance.name)
+                    instance.data["value"] *= 2
+                    instance.data["pid"] = os.getpid()
+
+                    if instance.name == "B":
+                        raise ValueError("Failed")
+            """))
+
+    pyblish.api.register_plugin_path(tempdir)
+
+    ctrl = control.Controller()
+    ctrl.was_processed.connect(results.append)
+
+    try:
+        ctrl.reset()
+        ctrl.publish()
+
+    finally:
+        ctrl.cleanup()
+        pyblish.api.deregister_plugin_path(tempdir)
+        shutil.rmtree(tempdir)
+
+    results = [r for r in results if r["plugin"].__name__ == "ExtractDouble"]
+    assert_equals([r["instance"].name for r in results], ["A", "B"])
+
+    for result in results:
+        instance = result["instance"]
+        assert_equals(instance.data["value"], 4)
+        assert instance.data["pid"] != os.getpid()
+        assert_equals([record.getMessage() for record in result["records"]],
+                      ["Doubling %s" % instance.name])
+
+        terminal = model.Terminal()
+        terminal.update_with_result(result)
+        assert_equals(terminal.data(terminal.index(0, 0), model.Label),
+                      "Doubling %s" % instance.name)
+
+    assert results[0]["success"]
+    assert not results[1]["success"]
+    assert_equals(str(results[1]["error"]), "Failed")
+    assert_equals(len(results[1]["error"].traceback), 4)
+
+
+@with_setup(clean)
+def test_multiprocess_changed():
+    """Processes of the pool run plug-ins as they are once changed"""
+
+    tempdir = tempfile.mkdtemp()
+    fname = os.path.join(tempdir, "extract_version.py")
+    results = list()
+
+    source = textwrap.dedent("""\
+        import pyblish.api
+
+        class CollectVersion(pyblish.api.ContextPlugin):
+            order = pyblish.api.CollectorOrder
+
+            def process(self, context):
+                context.create_instance("A")
+
+        class ExtractVersion(pyblish.api.InstancePlugin):
+            order = pyblish.api.ExtractorOrder
+            multiprocess = True
+
+            def process(self, instance):
+                instance.data["version"] = {version}
+        """)
+
+    pyblish.api.register_plugin_path(tempdir)
+
+    ctrl = control.Controller()
+
+    try:
+        # Of different size, as files are compared by time and size
+        for version in (1, 22):
+            with open(fname, "w") as f:
+                f.write(source.format(version=version))
+
+            ctrl.reset()
+            ctrl.publish()
+
+            results.append(ctrl.context[0].data["version"])
+
+    finally:
+        ctrl.cleanup()
+        pyblish.api.deregister_plugin_path(tempdir)
+        shutil.rmtree(tempdir)
+
+    assert_equals(results, [1, 22])
+
+
+def test_multiprocess_host():
+    """Hosts other than Python spawn processes with the given interpreter"""
+
+    class ExtractHost(pyblish.api.InstancePlugin):
+        order = pyblish.api.ExtractorOrder
+        multiprocess = True
+
+    # As though discovered from a file
+    ExtractHost.__module__ = __file__
+
+    ctrl = control.Controller()
+    executable = sys.executable
+    method = multiprocessing.get_start_method()
+
+    sys.executable = "/path/to/maya"
+    multiprocessing.set_start_method("spawn", force=True)
+
+    try:
+        assert not ctrl._is_pooled(ExtractHost)
+
+        settings.ProcessPoolExecutable = "/path/to/mayapy"
+        assert ctrl._is_pooled(ExtractHost)
+
+    finally:
+        sys.executable = executable
+        multiprocessing.set_start_method(method, force=True)
+        settings.ProcessPoolExecutable = None
+
+
+@with_setup(clean)
+def test_worker_thread():
+    """Plug-ins run in a worker thread, unless bound to the main thread"""
+
+    threads = dict()
+
+    class WorkerCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            threads["collector"] = threading.current_thread().ident
+            context.create_instance("A")
+
+    class WorkerValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def process(self, instance):
+            threads["worker"] = threading.current_thread().ident
+
+    class HostValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        main_thread = True
+
+        def process(self, instance):
+            threads["host"] = threading.current_thread().ident
+
+    class Listener(QtCore.QObject):
+        finished = False
+
+        def on_processed(self, result):
+            threads["listener"] = threading.current_thread().ident
+
+        def on_finished(self):
+            self.finished = True
+
+    for plugin in [WorkerCollector, WorkerValidator, HostValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    listener = Listener()
+
+    ctrl = control.Controller()
+    ctrl.was_processed.connect(listener.on_processed)
+    ctrl.was_finished.connect(listener.on_finished)
+
+    os.environ["PYBLISH_DELAY"] = "1"
+    settings.WorkerThread = True
+
+    try:
+        app = QtCore.QCoreApplication.instance()
+
+        for run in (ctrl.reset, ctrl.validate):
+            listener.finished = False
+            run()
+
+            while not listener.finished:
+                app.processEvents()
+
+    finally:
+        os.environ["PYBLISH_DELAY"] = "0"
+        settings.WorkerThread = False
+
+    main = threading.current_thread().ident
+    assert threads["collector"] == main, threads
+    assert threads["worker"] != main, threads
+    assert threads["host"] == main, threads
+    assert threads["listener"] == main, threads
+
+
+@with_setup(clean)
+def test_incremental_validation():
+    """Validation is reused for instances whose data is unchanged"""
+
+    count = {"#": 0}
+    values = {"A": 1, "B": 1}
+    results = list()
+
+    class IncrementalCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for name, value in sorted(values.items()):
+                context.create_instance(name, value=value)
+
+    class IncrementalValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def process(self, instance):
+            count["#"] += 1
+            assert instance.data["value"] == 1, "Wrong value"
+
+    for plugin in [IncrementalCollector, IncrementalValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    def on_processed(result):
+        if issubclass(result["plugin"], IncrementalValidator):
+            results.append(result)
+
+    ctrl = control.Controller()
+    ctrl.was_processed.connect(on_processed)
+
+    settings.IncrementalValidation = True
+
+    try:
+        ctrl.reset()
+        ctrl.validate()
+
+        assert count["#"] == 2, count
+
+        # Nothing changed
+        ctrl.reset()
+        ctrl.validate()
+
+        assert count["#"] == 2, count
+        assert_equals(len(results), 4)
+        assert_equals(results[-1]["instance"], ctrl.context[-1])
+
+        # Reused results cost nothing
+        assert_equals([r["duration"] for r in results[2:]], [0, 0])
+        assert not any(issubclass(r["plugin"], IncrementalValidator)
+                       for r in ctrl.slowest()), ctrl.slowest()
+
+        # One instance changed
+        values["B"] = 2
+        ctrl.reset()
+        ctrl.validate()
+
+        assert count["#"] == 3, count
+        assert results[-2]["success"]
+        assert not results[-1]["success"]
+        assert ctrl.current_error is not None
+
+    finally:
+        settings.IncrementalValidation = False
+
+
+@with_setup(clean)
+def test_incremental_validation_threadsafe():
+    """Reused results of threadsafe validators keep their records"""
+
+    results = list()
+
+    class IncrementalCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for name in ("A", "B"):
+                context.create_instance(name)
+
+    class IncrementalValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        threadsafe = True
+
+        def process(self, instance):
+            self.log.info(instance.name)
+
+    for plugin in [IncrementalCollector, IncrementalValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    def on_processed(result):
+        if issubclass(result["plugin"], IncrementalValidator):
+            results.append(result)
+
+    emitted = list()
+
+    def on_plugin_processed(result):
+        if issubclass(result["plugin"], IncrementalValidator):
+            emitted.append(result)
+
+    ctrl = control.Controller()
+    ctrl.was_processed.connect(on_processed)
+
+    settings.IncrementalValidation = True
+    pyblish.api.register_callback("pluginProcessed", on_plugin_processed)
+
+    try:
+        for attempt in range(3):
+            ctrl.reset()
+            ctrl.validate()
+
+            # Reused results are results like any other
+            assert_equals(
+                [r["instance"].name for r in ctrl.context.data["results"]
+                 if issubclass(r["plugin"], IncrementalValidator)],
+                ["A", "B"])
+
+    finally:
+        settings.IncrementalValidation = False
+        pyblish.api.deregister_callback("pluginProcessed",
+                                        on_plugin_processed)
+
+    assert_equals(len(results), 6)
+    assert_equals(len(emitted), 6)
+
+    for result in results:
+        messages = [record.msg for record in result["records"]]
+        assert_equals(messages, [result["instance"].name])
+
+
+@with_setup(clean)
+def test_validation_cache():
+    """Passing validation is reused across sessions"""
+
+    count = {"#": 0}
+    tempdir = tempfile.mkdtemp()
+
+    class CachedCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A", value=1)
+
+    class CachedValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def process(self, instance):
+            self.log.info("Validated")
+            count["#"] += 1
+
+    for plugin in [CachedCollector, CachedValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    settings.ValidationCache = True
+    settings.ValidationCachePath = os.path.join(tempdir, "cache.db")
+
+    try:
+        for session in range(2):
+            results = list()
+
+            ctrl = control.Controller()
+            ctrl.was_processed.connect(results.append)
+            ctrl.reset()
+            ctrl.validate()
+            ctrl.cleanup()
+
+            assert count["#"] == 1, count
+
+        result = results[-1]
+        assert result["success"]
+        assert_equals(result["instance"].name, "A")
+        assert_equals([record.msg for record in result["records"]],
+                      ["Validated"])
+
+        terminal = model.Terminal()
+        terminal.update_with_result(result)
+        assert_equals(terminal.data(terminal.index(0, 0), model.Label),
+                      "Validated")
+
+        ctrl = control.Controller()
+        ctrl.invalidate_validation_cache("CachedValidator")
+        ctrl.reset()
+        ctrl.validate()
+        ctrl.cleanup()
+
+        assert count["#"] == 2, count
+
+    finally:
+        settings.ValidationCache = False
+        settings.ValidationCachePath = None
+        shutil.rmtree(tempdir)
+
+
+@with_setup(clean)
+def test_validation_cache_module():
+    """Cached validation is forgotten once the module of a plug-in changes"""
+
+    tempdir = tempfile.mkdtemp()
+    plugins = os.path.join(tempdir, "plugins")
+    os.makedirs(plugins)
+
+    source = textwrap.dedent("""\
+        import pyblish.api
+
+        LIMIT = {limit}
+
+        class CollectValue(pyblish.api.ContextPlugin):
+            order = pyblish.api.CollectorOrder
+
+            def process(self, context):
+                context.create_instance("A", value=3)
+
+        class ValidateValue(pyblish.api.InstancePlugin):
+            order = pyblish.api.ValidatorOrder
+
+            def process(self, instance):
+                assert instance.data["value"] < LIMIT, "Too large"
+    """)
+
+    settings.ValidationCache = True
+    settings.ValidationCachePath = os.path.join(tempdir, "cache.db")
+    pyblish.api.register_plugin_path(plugins)
+
+    try:
+        for limit, success in ((5, True), (2, False)):
+            with open(os.path.join(plugins, "validate_value.py"), "w") as f:
+                f.write(source.format(limit=limit))
+
+            results = list()
+
+            ctrl = control.Controller()
+            ctrl.was_processed.connect(results.append)
+            ctrl.reset()
+            ctrl.validate()
+            ctrl.cleanup()
+
+            result = results[-1]
+            assert_equals(result["plugin"].__name__, "ValidateValue")
+            assert_equals(result["success"], success)
+
+    finally:
+        settings.ValidationCache = False
+        settings.ValidationCachePath = None
+        pyblish.api.deregister_plugin_path(plugins)
+        shutil.rmtree(tempdir)
+
+
+@with_setup(clean)
+def test_cached_discovery():
+    """Only changed modules of plug-ins are executed on reset"""
+
+    tempdir = tempfile.mkdtemp()
+    fname = os.path.join(tempdir, "discovered.py")
+    count = os.path.join(tempdir, "count.txt")
+
+    source = textwrap.dedent("""\
+        import pyblish.api
+
+        with open({count!r}, "a") as f:
+            f.write("x")
+
+        class {name}(pyblish.api.ContextPlugin):
+            order = pyblish.api.CollectorOrder
+    """)
+
+    def write(name):
+        with open(fname, "w") as f:
+            f.write(source.format(count=count, name=name))
+
+    def discovered():
+        return [p.__name__ for p in ctrl.plugins if p.__module__ == fname]
+
+    def executed():
+        with open(count) as f:
+            return len(f.read())
+
+    write("DiscoveredA")
+    pyblish.api.register_plugin_path(tempdir)
+
+    try:
+        ctrl = control.Controller()
+        ctrl.reset()
+        ctrl.reset()
+
+        assert_equals(executed(), 1)
+        assert_equals(discovered(), ["DiscoveredA"])
+
+        # Plug-ins are copies, unaffected by the previous session
+        first = set(ctrl.plugins)
+        ctrl.reset()
+        assert not first & set(ctrl.plugins)
+
+        write("DiscoveredBB")
+        ctrl.reset()
+
+        assert_equals(executed(), 2)
+        assert_equals(discovered(), ["DiscoveredBB"])
+
+        os.remove(fname)
+        ctrl.reset()
+
+        assert_equals(discovered(), [])
+
+    finally:
+        pyblish.api.deregister_plugin_path(tempdir)
+        shutil.rmtree(tempdir)
+
+
+@with_setup(clean)
+def test_dependency_graph():
+    """Plug-ins declaring their data are processed as it becomes available"""
+
+    order = list()
+    overlapped = dict()
+    started = {"a": threading.Event(), "b": threading.Event()}
+
+    class CollectA(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder + 0.2
+        provides_data = ["a"]
+
+        def process(self, context):
+            # Only seen started when processed concurrently
+            started["a"].set()
+            overlapped["a"] = started["b"].wait(5)
+            context.data["a"] = True
+            order.append("a")
+
+    class CollectB(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder + 0.3
+        provides_data = ["b"]
+
+        def process(self, context):
+            started["b"].set()
+            overlapped["b"] = started["a"].wait(5)
+            context.data["b"] = True
+            context.create_instance("B")
+            order.append("b")
+
+    class CollectC(pyblish.api.InstancePlugin):
+        order = pyblish.api.CollectorOrder + 0.1
+        requires_data = ["a", "b"]
+
+        def process(self, instance):
+            assert instance.context.data["a"]
+            assert instance.context.data["b"]
+            order.append("c")
+
+    for plugin in [CollectA, CollectB, CollectC]:
+        pyblish.api.register_plugin(plugin)
+
+    results = list()
+
+    ctrl = control.Controller()
+    ctrl.was_processed.connect(results.append)
+
+    ctrl.reset()
+
+    assert_equals(overlapped, {"a": True, "b": True})
+    assert_equals(order[-1], "c")
+    assert_equals([result["plugin"].__name__ for result in results[-3:]],
+                  ["CollectC", "CollectA", "CollectB"])
+    assert all(result["success"] for result in results), results
+
+
+@with_setup(clean)
+def test_dependency_graph_error():
+    """Unexpected errors of plug-ins in a graph interrupt processing"""
+
+    errors = list()
+
+    class CollectA(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+        provides_data = ["a"]
+
+    class CollectB(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder + 0.1
+        requires_data = ["a"]
+
+    class Controller(control.Controller):
+        def _process_in_thread(self, plugin, instance=None):
+            if issubclass(plugin, CollectA):
+                raise ValueError("Unexpected")
+
+            return super(Controller, self)._process_in_thread(
+                plugin, instance)
+
+    for plugin in [CollectA, CollectB]:
+        pyblish.api.register_plugin(plugin)
+
+    ctrl = Controller()
+    ctrl.was_interrupted.connect(errors.append)
+    ctrl.reset()
+
+    assert_equals(len(errors), 1)
+    assert "ValueError: Unexpected" in errors[0], errors
+
+
+def test_dependency_cycle():
+    """Plug-ins depending on each other are processed in order"""
+
+    class CollectA(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+        requires_data = ["b"]
+        provides_data = ["a"]
+
+    class CollectB(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder + 0.1
+        requires_data = ["a"]
+        provides_data = ["b"]
+
+    dependencies = control._dependencies([CollectA, CollectB])
+    assert_equals(dependencies, {CollectA: [], CollectB: [CollectA]})
+
+
+@with_setup(clean)
+def test_timing():
+    """Results carry their cost, slowest first"""
+
+    class SlowCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            time.sleep(0.05)
+
+    pyblish.api.register_plugin(SlowCollector)
+
+    results = list()
+
+    ctrl = control.Controller()
+    ctrl.was_processed.connect(results.append)
+    ctrl.reset()
+
+    for result in results:
+        assert result["duration"] >= 0
+        assert result["cpu_duration"] >= 0
+        assert "memory" in result
+
+    slowest = ctrl.slowest(1)
+    assert_equals(len(slowest), 1)
+    assert issubclass(slowest[0]["plugin"], SlowCollector)
+    assert slowest[0]["duration"] >= 50, slowest
+
+
+@with_setup(clean)
+def test_trace():
+    """Runs are written as a Chrome trace"""
+
+    class TracedCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A")
+
+    class TracedValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+
+    for plugin in [TracedCollector, TracedValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    tempdir = tempfile.mkdtemp()
+    settings.TracePath = os.path.join(tempdir, "trace.json")
+
+    try:
+        ctrl = control.Controller()
+        ctrl.reset()
+        ctrl.publish()
+
+        with open(settings.TracePath) as f:
+            events = json.load(f)["traceEvents"]
+
+    finally:
+        settings.TracePath = None
+        shutil.rmtree(tempdir)
+
+    spans = [event for event in events if event["ph"] == "X"]
+    names = [span["name"] for span in spans]
+
+    assert "reset" in names, names
+    assert "publish" in names, names
+    assert "TracedCollector" in names, names
+    assert "TracedValidator (A)" in names, names
+    assert "event loop" in names, names
+
+    for span in spans:
+        assert span["dur"] >= 0, span
+
+
+@with_setup(clean)
+def test_trace_reset():
+    """Each reset starts a new trace"""
+
+    tempdir = tempfile.mkdtemp()
+    settings.TracePath = os.path.join(tempdir, "trace.json")
+
+    try:
+        ctrl = control.Controller()
+
+        for attempt in range(3):
+            ctrl.reset()
+            ctrl.publish()
+
+        with open(settings.TracePath) as f:
+            events = json.load(f)["traceEvents"]
+
+    finally:
+        settings.TracePath = None
+        shutil.rmtree(tempdir)
+
+    names = [event["name"] for event in events if event["ph"] == "X"]
+    assert_equals(names.count("reset"), 1)
+    assert_equals(names.count("publish"), 1)
@@ -0,0 +1,148 @@
+import json
+import os
+
+import pyblish.api
+from pyblish_lite import headless
+from pyblish_lite.vendor import six
+
+# Vendor libraries
+from nose.tools import (
+    with_setup,
+    assert_equals
+)
+
+
+def clean():
+    pyblish.api.deregister_all_plugins()
+
+
+def setup_function(function):
+    # Runners other than nose, such as pytest, ignore @with_setup
+    clean()
+
+
+@with_setup(clean)
+def test_publish():
+    """Each result is written as a line of JSON, followed by a summary"""
+
+    class HeadlessCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A")
+
+    class HeadlessValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def process(self, instance):
+            self.log.info("Validating %s", instance.name)
+
+    for plugin in [HeadlessCollector, HeadlessValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    stream = six.StringIO()
+    summary = headless.publish(stream)
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    results = dict((line["plugin"], line)
+                   for line in lines if line["type"] == "result")
+
+    assert summary["success"], summary
+    assert_equals(lines[-1], summary)
+    assert_equals(results["HeadlessValidator"]["instance"], "A")
+    assert_equals(results["HeadlessValidator"]["records"][0]["message"],
+                  "Validating A")
+
+
+@with_setup(clean)
+def test_publish_failed_validation():
+    """Failed validation stops publishing and fails the summary"""
+
+    count = {"#": 0}
+
+    class FailingCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A")
+
+    class FailingValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def process(self, instance):
+            raise ValueError("Invalid")
+
+    class SkippedExtractor(pyblish.api.InstancePlugin):
+        order = pyblish.api.ExtractorOrder
+
+        def process(self, instance):
+            count["#"] += 1
+
+    for plugin in [FailingCollector, FailingValidator, SkippedExtractor]:
+        pyblish.api.register_plugin(plugin)
+
+    stream = six.StringIO()
+    summary = headless.publish(stream)
+
+    assert not summary["success"], summary
+    assert_equals(summary["failed"], 1)
+    assert_equals(count["#"], 0)
+
+
+@with_setup(clean)
+def test_publish_unexpected_error():
+    """Unexpected errors are written as a line of JSON, too"""
+
+    class ErrorCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A")
+
+    class ErrorValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def process(self, instance):
+            pass
+
+    def test(**vars):
+        if vars["nextOrder"] >= pyblish.api.ValidatorOrder:
+            raise ValueError("Unexpected")
+
+    for plugin in [ErrorCollector, ErrorValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    pyblish.api.register_test(test)
+
+    try:
+        stream = six.StringIO()
+        summary = headless.publish(stream)
+
+    finally:
+        pyblish.api.deregister_test()
+
+    # Every line remains JSON
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    errors = [line for line in lines if line["type"] == "error"]
+
+    assert not summary["success"], summary
+    assert_equals(len(errors), 1)
+    assert "ValueError: Unexpected" in errors[0]["traceback"], errors
+
+
+@with_setup(clean)
+def test_publish_delay():
+    """Deferred calls of the host are unaffected once published"""
+
+    delay = os.environ.get("PYBLISH_DELAY")
+    os.environ["PYBLISH_DELAY"] = "1"
+
+    try:
+        headless.publish(six.StringIO())
+        assert_equals(os.environ["PYBLISH_DELAY"], "1")
+
+    finally:
+        if delay is None:
+            os.environ.pop("PYBLISH_DELAY")
+        else:
+            os.environ["PYBLISH_DELAY"] = delay
@@ -1,7 +1,9 @@
 # -*- coding=UTF-8 -*-
 import logging
 
-from pyblish_lite import model
+import pyblish.api
+
+from pyblish_lite import model, settings
 from pyblish_lite.vendor import six
 
 
@@ -29,3 +31,359 @@ def test_label_nonstring():
     for item in model_:
         assert isinstance(item.data(model.Label), six.text_type), (
             "\"%s\" wasn't a string!" % item.data(model.Label))
+
+
+def test_accumulate_duration():
+    """Plug-ins and instances total the cost of each pair"""
+
+    class MyPlugin(pyblish.api.InstancePlugin):
+        pass
+
+    context = pyblish.api.Context()
+    instances = [context.create_instance(name, family="a")
+                 for name in ("A", "B")]
+
+    plugins = model.Plugin()
+    plugins.append(MyPlugin)
+
+    instances_ = model.Instance()
+    for instance in instances:
+        instances_.append(instance)
+
+    for instance, duration in zip(instances, (10.0, 5.0)):
+        result = {
+            "success": True,
+            "plugin": MyPlugin,
+            "instance": instance,
+            "error": None,
+            "records": [],
+            "duration": duration,
+            "cpu_duration": duration / 2,
+            "memory": 1024,
+        }
+
+        plugins.update_with_result(result)
+        instances_.update_with_result(result)
+
+    index = plugins.index(0, 0)
+    assert index.data(model.Duration) == 15.0, index.data(model.Duration)
+    assert index.data(model.CpuDuration) == 7.5
+    assert index.data(model.Memory) == 2048
+
+    index = instances_.index(1, 0)
+    assert index.data(model.Duration) == 5.0
+
+
+def test_row():
+    """Rows of items are found by identity"""
+
+    context = pyblish.api.Context()
+    instances = [context.create_instance(name, family="a")
+                 for name in ("A", "B", "C")]
+
+    model_ = model.Instance()
+    for instance in instances:
+        model_.append(instance)
+
+    # Instances compare equal when empty, but are distinct items
+    assert [model_.row(instance) for instance in instances] == [0, 1, 2]
+
+    model_.reset()
+
+    try:
+        model_.row(instances[0])
+    except ValueError:
+        pass
+    else:
+        assert False, "Reset model still had instance"
+
+
+def test_transaction():
+    """Changes within a transaction are signalled once"""
+
+    model_ = model.Terminal()
+    for label in ("a", "b", "c"):
+        model_.append({"label": label, "type": "info"})
+
+    changes = list()
+    model_.dataChanged.connect(
+        lambda first, last, roles=None: changes.append(
+            (first.row(), last.row())))
+
+    with model_.transaction():
+        for index in model_:
+            model_.setData(index, "d", model.Label)
+
+        with model_.transaction():
+            model_.setData(model_.index(1, 0), "e", model.Type)
+
+        assert changes == [], changes
+
+    assert changes == [(0, 2)], changes
+    assert [item["label"] for item in model_.items] == ["d", "d", "d"]
+
+    # Outside of transactions, changes are signalled immediately
+    model_.setData(model_.index(2, 0), "f", model.Label)
+    assert changes == [(0, 2), (2, 2)], changes
+
+
+def test_inclusion():
+    """Including a family twice filters once"""
+
+    class CollectA(pyblish.api.ContextPlugin):
+        families = ["a"]
+
+    class CollectB(pyblish.api.ContextPlugin):
+        families = ["b"]
+
+    source = model.Plugin()
+    source.append(CollectA)
+    source.append(CollectB)
+
+    proxy = model.ProxyModel(source)
+    proxy.set_inclusion([])
+
+    filtered = list()
+    proxy.invalidateFilter = lambda: filtered.append(True)
+
+    proxy.add_inclusion(role="families", value="a")
+    proxy.add_inclusion(role="families", value="a")
+
+    assert proxy.includes == {"families": set(["a"])}, proxy.includes
+    assert len(filtered) == 1, filtered
+
+    del proxy.invalidateFilter
+    proxy.invalidateFilter()
+    assert proxy.rowCount() == 1, proxy.rowCount()
+
+
+def test_inclusion_index():
+    """Including a family no plug-in supports does not filter"""
+
+    class CollectA(pyblish.api.ContextPlugin):
+        families = ["a"]
+
+    class CollectB(pyblish.api.ContextPlugin):
+        families = ["b", "c"]
+
+    source = model.Plugin()
+    source.append(CollectA)
+
+    proxy = model.ProxyModel(source)
+    proxy.set_inclusion([("families", "b")])
+    assert proxy.rowCount() == 0, proxy.rowCount()
+
+    # Appended after filtering
+    source.append(CollectB)
+    assert proxy.rowCount() == 1, proxy.rowCount()
+
+    filtered = list()
+    proxy.invalidateFilter = lambda: filtered.append(True)
+
+    proxy.add_inclusion(role="families", value="c")
+    proxy.add_inclusion(role="families", value="d")
+    assert filtered == [], filtered
+
+    proxy.add_inclusion(role="families", value="a")
+    assert filtered == [True], filtered
+
+    del proxy.invalidateFilter
+    proxy.invalidateFilter()
+    assert proxy.rowCount() == 2, proxy.rowCount()
+
+    source.reset()
+    source.append(CollectA)
+    assert proxy.rowCount() == 1, proxy.rowCount()
+
+
+def test_terminal_capacity():
+    """Records beyond capacity are archived and read back"""
+
+    capacity = settings.TerminalCapacity
+    settings.TerminalCapacity = 150
+
+    try:
+        model_ = model.Terminal()
+        for number in range(1000):
+            model_.append({"label": "record %d" % number, "type": "info"})
+
+        assert model_.rowCount() == 1000, model_.rowCount()
+        assert len(model_.items) < 250, len(model_.items)
+        assert len(model_.archive) > 0
+
+        labels = [model_.data(index, model.Label) for index in model_]
+        assert labels == ["record %d" % n for n in range(1000)], labels
+
+        model_.reset()
+        assert model_.rowCount() == 0, model_.rowCount()
+        assert len(model_.archive) == 0
+
+    finally:
+        settings.TerminalCapacity = capacity
+
+
+def test_terminal_record():
+    """Log records are stored compactly, yet behave like dicts"""
+
+    record = logging.LogRecord(
+        "mock", logging.INFO, "/mock.py", 1, "Hello %s", ("World",), None)
+
+    model_ = model.Terminal()
+    model_.update_with_result({"records": [record], "error": None})
+
+    index = model_.index(0, 0)
+    assert model_.data(index, model.Label) == "Hello World"
+    assert model_.data(index, model.LogLevel) == "INFO"
+
+    data = model_.data(index, model.Data)
+    assert not hasattr(data, "__dict__")
+    assert dict(data.items())["name"] == "mock", data
+
+
+def test_terminal_lazy_label():
+    """Messages of log records are formatted once looked at"""
+
+    formatted = list()
+
+    class Argument(object):
+        def __str__(self):
+            formatted.append(True)
+            return "World"
+
+    record = logging.LogRecord(
+        "mock", logging.INFO, "/mock.py", 1, "Hello %s", (Argument(),), None)
+
+    model_ = model.Terminal()
+    model_.update_with_result({"records": [record], "error": None})
+    assert formatted == [], formatted
+
+    index = model_.index(0, 0)
+    for attempt in range(2):
+        assert model_.data(index, model.Label) == "Hello World"
+
+    assert formatted == [True], formatted
+
+
+def test_extend():
+    """Records of a result are inserted at once"""
+
+    records = [
+        logging.LogRecord(
+            "mock", logging.INFO, "/mock.py", 1, "Record %d", (number,), None)
+        for number in range(5000)
+    ]
+
+    model_ = model.Terminal()
+
+    inserted = list()
+    model_.rowsInserted.connect(
+        lambda parent, first, last: inserted.append((first, last)))
+
+    model_.update_with_result({"records": records, "error": None})
+    model_.extend([])
+
+    assert inserted == [(0, 4999)], inserted
+    assert model_.data(model_.index(4999, 0), model.Label) == "Record 4999"
+
+
+def test_restore_checkstate():
+    """Check states are restored by families and label, at once"""
+
+    context = pyblish.api.Context()
+    for name in ("a", "b", "c"):
+        context.create_instance(name, family="mock")
+
+    model_ = model.Instance()
+    model_.extend(context)
+
+    model_.setData(model_.index(1, 0), False, model.IsChecked)
+    model_.store_checkstate()
+
+    model_.reset()
+    for instance in context:
+        instance.data["publish"] = True
+
+    model_.extend(reversed(context))
+
+    changes = list()
+    model_.dataChanged.connect(
+        lambda first, last, roles=None: changes.append(
+            (first.row(), last.row())))
+
+    model_.restore_checkstate()
+
+    states = [model_.data(index, model.IsChecked) for index in model_]
+    assert states == [True, False, True], states
+    assert changes == [(1, 1)], changes
+
+
+def test_actions_memoized():
+    """Actions are computed once per change of state"""
+
+    class OnFailed(pyblish.api.Action):
+        on = "failed"
+
+    class MyPlugin(pyblish.api.ContextPlugin):
+        actions = [OnFailed]
+
+    model_ = model.Plugin()
+    model_.append(MyPlugin)
+    index = model_.index(0, 0)
+
+    computed = list()
+    action_data = model_._action_data
+    model_._action_data = lambda item, role: (
+        computed.append(role) or action_data(item, role))
+
+    for attempt in range(3):
+        assert model_.data(index, model.ActionIconVisible) is False
+        assert model_.data(index, model.Actions) == []
+
+    assert len(computed) == 2, computed
+
+    model_.setData(index, True, model.HasFailed)
+
+    assert model_.data(index, model.ActionIconVisible) is True
+    assert model_.data(index, model.Actions) == [OnFailed]
+    assert len(computed) == 4, computed
+
+    model_.setData(index, False, model.IsChecked)
+    assert model_.data(index, model.ActionIconVisible) is None
+
+
+def test_terminal_record_without_args():
+    """Records without arguments are labelled by their message"""
+
+    record = logging.makeLogRecord(
+        {"msg": "100% done", "args": None, "levelno": logging.INFO})
+
+    model_ = model.Terminal()
+    model_.update_with_result({"records": [record], "error": None})
+
+    index = model_.index(0, 0)
+    assert model_.data(index, model.Label) == "100% done"
+
+
+def test_terminal_record_bad_args():
+    """Records whose arguments do not match are labelled and archived"""
+
+    capacity = settings.TerminalCapacity
+    settings.TerminalCapacity = 100
+
+    try:
+        model_ = model.Terminal()
+
+        for number in range(300):
+            args = ("x",) if number == 0 else (number,)
+            msg = "%s %s" if number == 0 else "record %d"
+            record = logging.makeLogRecord(
+                {"msg": msg, "args": args, "levelno": logging.INFO})
+            model_.update_with_result({"records": [record], "error": None})
+
+        label = model_.data(model_.index(0, 0), model.Label)
+        assert label == "%s %s", label
+        assert len(model_.items) < 200, len(model_.items)
+        assert len(model_.archive) > 0
+
+    finally:
+        settings.TerminalCapacity = capacity
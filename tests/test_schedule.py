@@ -0,0 +1,75 @@
+import pyblish.api
+
+from pyblish_lite import schedule
+
+# Vendor libraries
+from nose.tools import assert_equals
+
+
+def test_seek():
+    """Plug-ins are found by order"""
+
+    class Collect(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+    class Validate(pyblish.api.ContextPlugin):
+        order = pyblish.api.ValidatorOrder
+
+    class ValidateLater(pyblish.api.ContextPlugin):
+        order = pyblish.api.ValidatorOrder + 0.1
+
+    class Extract(pyblish.api.ContextPlugin):
+        order = pyblish.api.ExtractorOrder
+
+    plugins = [Collect, Validate, ValidateLater, Extract]
+    sched = schedule.Schedule(plugins, pyblish.api.Context())
+
+    assert_equals(sched.seek(-float("inf")), 0)
+    assert_equals(sched.seek(pyblish.api.ValidatorOrder - 0.5), 1)
+    assert_equals(sched.seek(ValidateLater.order - 0.5), 1)
+    assert_equals(sched.seek(pyblish.api.ExtractorOrder - 0.5), 3)
+    assert_equals(sched.seek(pyblish.api.IntegratorOrder - 0.5), 4)
+
+    assert_equals([pair[0] for pair in sched.pairs(3)], [Extract])
+
+
+def test_instances_added():
+    """Instances are matched once the plug-in is reached"""
+
+    class Collect(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            pass
+
+    class ValidateA(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        families = ["a"]
+
+    class ValidateAny(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder + 0.1
+        families = ["*"]
+
+    context = pyblish.api.Context()
+    sched = schedule.Schedule([Collect, ValidateA, ValidateAny], context)
+
+    pairs = sched.pairs()
+    assert_equals(next(pairs), (Collect, None))
+
+    # As though created by the collector
+    a1 = context.create_instance("a1", family="a")
+    b1 = context.create_instance("b1", family="b")
+    a2 = context.create_instance("a2", family="b")
+    a2.data["families"] = ["a"]
+
+    assert_equals(list(pairs), [
+        (ValidateA, a1),
+        (ValidateA, a2),
+        (ValidateAny, a1),
+        (ValidateAny, b1),
+        (ValidateAny, a2),
+    ])
+
+    # Families are matched anew when changed
+    b1.data["family"] = "a"
+    assert_equals(sched.instances(1), [a1, b1, a2])